@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 import argparse
 import asyncio
-import json
 import logging
 import sys
 from getpass import getpass
@@ -12,7 +11,9 @@ if __name__ == "__main__":
     sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # pylint: disable=wrong-import-position
-from pyhon import Hon, HonAPI, diagnose, printer
+from pyhon import Hon, HonAPI, codec, diagnose, printer
+from pyhon.appliance import HonAppliance
+from pyhon.connection.cache import HonFileCache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,26 +39,46 @@ def get_arguments() -> Dict[str, Any]:
         "translate", help="language (de, en, fr...)", metavar="LANGUAGE"
     )
     translation.add_argument("--json", help="print as json", action="store_true")
+    bench = subparser.add_parser(
+        "benchmark", help="compare json backends on exported data"
+    )
+    bench.add_argument("benchmark", help="directory of exported data")
+    bench.add_argument("--number", help="repetitions", type=int, default=100)
     parser.add_argument("-i", "--import", help="import pyhon data", nargs="?")
     return vars(parser.parse_args())
 
 
 async def translate(language: str, json_output: bool = False) -> None:
-    async with HonAPI(anonymous=True) as hon:
+    cache = HonFileCache(Path.home() / ".pyhon" / "cache")
+    async with HonAPI(anonymous=True, cache=cache) as hon:
         keys = await hon.translation_keys(language)
     if json_output:
-        print(json.dumps(keys, indent=4))
+        print(codec.dumps(keys, indent=True))
     else:
         clean_keys = (
-            json.dumps(keys)
+            codec.dumps(keys)
             .replace("\\n", "\\\\n")
             .replace("\\\\r", "")
             .replace("\\r", "")
         )
-        keys = json.loads(clean_keys)
+        keys = codec.loads(clean_keys)
         print(printer.pretty_print(keys))
 
 
+def benchmark(path: Path, number: int) -> None:
+    results = codec.benchmark(path, number)
+    baseline = results["json"]
+    print(f"{'backend':<8} {'decode':>9} {'encode':>9}")
+    for name, timing in results.items():
+        decode, encode = timing["decode"], timing["encode"]
+        speedup = baseline["decode"] / decode, baseline["encode"] / encode
+        print(
+            f"{name:<8} {decode:>8.3f}s {encode:>8.3f}s"
+            f"  (x{speedup[0]:.1f} / x{speedup[1]:.1f})"
+        )
+    print(f"Default backend: {codec.backend()}")
+
+
 def get_login_data(args: Dict[str, str]) -> Tuple[str, str]:
     if not (user := args["user"]):
         user = input("User for hOn account: ")
@@ -66,23 +87,30 @@ def get_login_data(args: Dict[str, str]) -> Tuple[str, str]:
     return user, password
 
 
+async def export_data(device: HonAppliance, args: Dict[str, Any]) -> None:
+    anonymous = args.get("anonymous", False)
+    path = Path(args.get("directory", "."))
+    if not args.get("zip"):
+        for file in await diagnose.appliance_data(device, path, anonymous):
+            print(f"Created {file}")
+    else:
+        archive = await diagnose.zip_archive(device, path, anonymous)
+        print(f"Created {archive}")
+
+
 async def main() -> None:
     args = get_arguments()
     if language := args.get("translate"):
         await translate(language, json_output=args.get("json", ""))
         return
+    if directory := args.get("benchmark"):
+        benchmark(Path(directory), args.get("number", 100))
+        return
     test_data_path = Path(path) if (path := args.get("import", "")) else None
     async with Hon(*get_login_data(args), test_data_path=test_data_path) as hon:
         for device in hon.appliances:
             if args.get("export"):
-                anonymous = args.get("anonymous", False)
-                path = Path(args.get("directory", "."))
-                if not args.get("zip"):
-                    for file in await diagnose.appliance_data(device, path, anonymous):
-                        print(f"Created {file}")
-                else:
-                    archive = await diagnose.zip_archive(device, path, anonymous)
-                    print(f"Created {archive}")
+                await export_data(device, args)
                 continue
             print("=" * 10, device.appliance_type, "-", device.nick_name, "=" * 10)
             if args.get("keys"):
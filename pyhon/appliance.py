@@ -1,11 +1,13 @@
+import asyncio
 import importlib
 import logging
 import re
+from copy import deepcopy
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Any, TYPE_CHECKING, List, TypeVar, overload
 
-from pyhon import diagnose, exceptions
+from pyhon import diagnose, exceptions, metrics
 from pyhon.appliances.base import ApplianceBase
 from pyhon.attributes import HonAttribute
 from pyhon.command_loader import HonCommandLoader
@@ -26,9 +28,15 @@ T = TypeVar("T")
 # pylint: disable=too-many-public-methods,too-many-instance-attributes
 class HonAppliance:
     _MINIMAL_UPDATE_INTERVAL = 5  # seconds
+    _LOAD_RETRY = 60  # seconds
 
     def __init__(
-        self, api: Optional["HonAPI"], info: Dict[str, Any], zone: int = 0
+        self,
+        api: Optional["HonAPI"],
+        info: Dict[str, Any],
+        zone: int = 0,
+        template: Optional["HonAppliance"] = None,
+        lazy: bool = False,
     ) -> None:
         if attributes := info.get("attributes"):
             info["attributes"] = {v["parName"]: v["parValue"] for v in attributes}
@@ -43,6 +51,13 @@ class HonAppliance:
         self._additional_data: Dict[str, Any] = {}
         self._last_update: Optional[datetime] = None
         self._default_setting = HonParameter("", {}, "")
+        self._template: Optional[HonAppliance] = template
+        self._lazy: bool = lazy
+        self._loaded: bool = False
+        self._load_task: Optional[asyncio.Task[None]] = None
+        self._load_failed: Optional[datetime] = None
+        self._update_task: Optional[asyncio.Task[None]] = None
+        self._last_mqtt_update: Optional[datetime] = None
         self._connection = (
             not self._attributes.get("lastConnEvent", {}).get("category", "")
             == "DISCONNECTED"
@@ -54,6 +69,11 @@ class HonAppliance:
             ).Appliance(self)
         except ModuleNotFoundError:
             self._extra = None
+        self._minimal_update_interval: float = (
+            self._extra.MINIMAL_UPDATE_INTERVAL
+            if self._extra and self._extra.MINIMAL_UPDATE_INTERVAL is not None
+            else self._MINIMAL_UPDATE_INTERVAL
+        )
 
     def _get_nested_item(self, item: str) -> Any:
         result: List[Any] | Dict[str, Any] = self.data
@@ -102,6 +122,15 @@ class HonAppliance:
     def connection(self, connection: bool) -> None:
         self._connection = connection
 
+    @property
+    def last_mqtt_update(self) -> Optional[datetime]:
+        """Time of last status message received via mqtt"""
+        return self._last_mqtt_update
+
+    @last_mqtt_update.setter
+    def last_mqtt_update(self, last_update: Optional[datetime]) -> None:
+        self._last_mqtt_update = last_update
+
     @property
     def appliance_model_id(self) -> str:
         return str(self._info.get("applianceModelId", ""))
@@ -150,20 +179,27 @@ class HonAppliance:
     def model_id(self) -> int:
         return int(self._info.get("applianceModelId", 0))
 
+    @property
+    def appliance_model(self) -> Dict[str, Any]:
+        return self._appliance_model
+
     @property
     def options(self) -> Dict[str, Any]:
         return dict(self._appliance_model.get("options", {}))
 
     @property
     def commands(self) -> Dict[str, HonCommand]:
+        self._schedule_load()
         return self._commands
 
     @property
     def attributes(self) -> Dict[str, Any]:
+        self._schedule_load()
         return self._attributes
 
     @property
     def statistics(self) -> Dict[str, Any]:
+        self._schedule_load()
         return self._statistics
 
     @property
@@ -178,6 +214,19 @@ class HonAppliance:
     def zone(self) -> int:
         return self._zone
 
+    @property
+    def minimal_update_interval(self) -> float:
+        """Seconds in which repeated update calls are served without request"""
+        return self._minimal_update_interval
+
+    @minimal_update_interval.setter
+    def minimal_update_interval(self, interval: float) -> None:
+        self._minimal_update_interval = interval
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
     @property
     def api(self) -> "HonAPI":
         """api connection object"""
@@ -185,17 +234,17 @@ class HonAppliance:
             raise exceptions.NoAuthenticationException("Missing hOn login")
         return self._api
 
-    async def load_commands(self) -> None:
-        command_loader = HonCommandLoader(self.api, self)
-        await command_loader.load_commands()
+    def _set_commands(self, command_loader: HonCommandLoader) -> None:
         self._commands = command_loader.commands
         self._additional_data = command_loader.additional_data
         self._appliance_model = command_loader.appliance_data
-        self.sync_params_to_command("settings")
 
-    async def load_attributes(self) -> None:
-        attributes = await self.api.load_attributes(self)
-        for name, values in attributes.pop("shadow", {}).get("parameters", {}).items():
+    def _set_attributes(self, attributes: Dict[str, Any]) -> None:
+        parameters = attributes.pop("shadow", {}).get("parameters", {})
+        metrics.registry.inc(
+            "pyhon_attributes_updated_total", len(parameters), source="api"
+        )
+        for name, values in parameters.items():
             if name in self._attributes.get("parameters", {}):
                 self._attributes["parameters"][name].update(values)
             else:
@@ -206,17 +255,121 @@ class HonAppliance:
         if self._extra:
             self._attributes = self._extra.attributes(self._attributes)
 
+    async def load_commands(self) -> None:
+        command_loader = HonCommandLoader(self.api, self)
+        await command_loader.load_commands()
+        self._set_commands(command_loader)
+        self.sync_params_to_command("settings")
+        # Loaded step by step, don't let ensure_loaded replace the commands
+        self._loaded = True
+
+    async def load_attributes(self) -> None:
+        self._set_attributes(await self.api.load_attributes(self))
+
     async def load_statistics(self) -> None:
-        self._statistics = await self.api.load_statistics(self)
-        self._statistics |= await self.api.load_maintenance(self)
+        statistics, maintenance = await asyncio.gather(
+            self.api.load_statistics(self), self.api.load_maintenance(self)
+        )
+        self._statistics = statistics | maintenance
+
+    async def bootstrap(self) -> None:
+        """Load commands, attributes and statistics in one parallel step"""
+        command_loader = HonCommandLoader(self.api, self)
+        _, attributes, statistics, maintenance = await asyncio.gather(
+            command_loader.load_commands(),
+            self.api.load_attributes(self),
+            self.api.load_statistics(self),
+            self.api.load_maintenance(self),
+        )
+        self._set_commands(command_loader)
+        self._set_attributes(attributes)
+        self._statistics = statistics | maintenance
+        self.sync_params_to_command("settings")
+        self._loaded = True
+
+    def load_from(self, appliance: "HonAppliance") -> None:
+        """Take over loaded data of the same physical appliance, e.g. for zones"""
+        memo: Dict[int, Any] = {id(appliance): self, id(appliance.api): self.api}
+        self._commands = deepcopy(appliance.commands, memo)
+        for command in self._commands.values():
+            command.set_zone(self._zone)
+        self._additional_data = deepcopy(appliance.additional_data)
+        self._appliance_model = deepcopy(appliance.appliance_model)
+        self._attributes = deepcopy(appliance.attributes)
+        self._statistics = deepcopy(appliance.statistics)
+        self.sync_params_to_command("settings")
+        self._loaded = True
+
+    async def _load(self) -> None:
+        try:
+            if self._template is not None:
+                await self._template.ensure_loaded()
+                self.load_from(self._template)
+            else:
+                await self.bootstrap()
+        except (KeyError, ValueError, IndexError) as error:
+            _LOGGER.exception(error)
+            _LOGGER.error("Device data - %s", self._info)
+            self._loaded = True
+
+    def _on_load_done(self, task: "asyncio.Task[None]") -> None:
+        if task.cancelled() or (error := task.exception()) is not None:
+            if not task.cancelled():
+                _LOGGER.warning("Can't load %s - %s", self.nick_name, error)
+            self._load_failed = datetime.now()
+            self._load_task = None
+
+    def _start_load(self) -> "asyncio.Task[None]":
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self._load())
+            self._load_task.add_done_callback(self._on_load_done)
+        return self._load_task
+
+    def _schedule_load(self) -> None:
+        """Start loading in background on first access in lazy mode"""
+        if not self._lazy or self._loaded or self._load_task is not None:
+            return
+        retry = timedelta(seconds=self._LOAD_RETRY)
+        if self._load_failed and datetime.now() - self._load_failed < retry:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._start_load()
+
+    async def ensure_loaded(self) -> None:
+        """Load commands, attributes and statistics if not done yet"""
+        if not self._loaded:
+            await asyncio.shield(self._start_load())
+
+    async def _update(self) -> None:
+        await self.load_attributes()
+        self.sync_params_to_command("settings")
+
+    def _on_update_done(self, task: "asyncio.Task[None]") -> None:
+        self._update_task = None
+        if not task.cancelled() and (error := task.exception()) is not None:
+            _LOGGER.debug("Update of %s failed - %s", self.nick_name, error)
 
     async def update(self, force: bool = False) -> None:
-        now = datetime.now()
-        min_age = now - timedelta(seconds=self._MINIMAL_UPDATE_INTERVAL)
-        if force or not self._last_update or self._last_update < min_age:
+        """Refresh attributes, concurrent calls share one request"""
+        await self.ensure_loaded()
+        if self._update_task is None:
+            now = datetime.now()
+            min_age = now - timedelta(seconds=self._minimal_update_interval)
+            if not force and self._last_update and self._last_update >= min_age:
+                return
             self._last_update = now
-            await self.load_attributes()
-            self.sync_params_to_command("settings")
+            self._update_task = asyncio.create_task(self._update())
+            self._update_task.add_done_callback(self._on_update_done)
+        await asyncio.shield(self._update_task)
+
+    async def update_statistics(self) -> None:
+        self._statistics |= await self.api.load_statistics(self)
+
+    async def update_maintenance(self) -> None:
+        self._statistics |= await self.api.load_maintenance(self)
 
     @property
     def command_parameters(self) -> Dict[str, Dict[str, str | float]]:
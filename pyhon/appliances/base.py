@@ -1,4 +1,4 @@
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, TYPE_CHECKING, Optional
 
 from pyhon.parameter.program import HonParameterProgram
 
@@ -7,6 +7,8 @@ if TYPE_CHECKING:
 
 
 class ApplianceBase:
+    MINIMAL_UPDATE_INTERVAL: Optional[float] = None  # seconds
+
     def __init__(self, appliance: "HonAppliance"):
         self.parent = appliance
 
@@ -0,0 +1,125 @@
+import json
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# pylint: disable=no-member,c-extension-no-member
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any, bool, bool], bytes]
+
+
+def _stdlib_dumps(data: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    if indent:
+        text = json.dumps(data, indent=2, sort_keys=sort_keys, ensure_ascii=False)
+    else:
+        text = json.dumps(
+            data, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False
+        )
+    return text.encode()
+
+
+def _orjson_backend() -> Optional[JsonBackend]:
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    def _dumps(data: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        option |= orjson.OPT_INDENT_2 if indent else 0
+        option |= orjson.OPT_SORT_KEYS if sort_keys else 0
+        result: bytes = orjson.dumps(data, option=option)
+        return result
+
+    return JsonBackend("orjson", orjson.loads, _dumps)
+
+
+def _ujson_backend() -> Optional[JsonBackend]:
+    try:
+        import ujson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    def _loads(data: bytes | str) -> Any:
+        try:
+            return ujson.loads(data)
+        except ValueError as error:
+            doc = data.decode(errors="replace") if isinstance(data, bytes) else data
+            raise json.JSONDecodeError(str(error), doc, 0) from error
+
+    def _dumps(data: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        text: str = ujson.dumps(
+            data,
+            indent=2 if indent else 0,
+            sort_keys=sort_keys,
+            ensure_ascii=False,
+            escape_forward_slashes=False,
+        )
+        return text.encode()
+
+    return JsonBackend("ujson", _loads, _dumps)
+
+
+def _backends() -> Dict[str, JsonBackend]:
+    backends = [_orjson_backend(), _ujson_backend()]
+    stdlib = JsonBackend("json", json.loads, _stdlib_dumps)
+    return {backend.name: backend for backend in [*backends, stdlib] if backend}
+
+
+BACKENDS: Dict[str, JsonBackend] = _backends()
+_backend: JsonBackend = next(iter(BACKENDS.values()))
+
+
+def backend() -> str:
+    return _backend.name
+
+
+def use(name: str) -> None:
+    """Select json backend by name, e.g. 'orjson', 'ujson' or 'json'"""
+    global _backend  # pylint: disable=global-statement
+    if name not in BACKENDS:
+        raise ValueError(f"Json backend '{name}' not available")
+    _backend = BACKENDS[name]
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode json, raises json.JSONDecodeError for every backend"""
+    return _backend.loads(data)
+
+
+def dumpb(data: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    return _backend.dumps(data, indent, sort_keys)
+
+
+def dumps(data: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    return _backend.dumps(data, indent, sort_keys).decode()
+
+
+def benchmark(path: Path, number: int = 100) -> Dict[str, Dict[str, float]]:
+    """Time decoding and encoding of all json files below path per backend"""
+    payloads: List[bytes] = [file.read_bytes() for file in path.rglob("*.json")]
+    results: Dict[str, Dict[str, float]] = {}
+    for name, json_backend in BACKENDS.items():
+        decoded = [json_backend.loads(payload) for payload in payloads]
+        start = time.perf_counter()
+        for _ in range(number):
+            for payload in payloads:
+                json_backend.loads(payload)
+        decode = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(number):
+            for data in decoded:
+                json_backend.dumps(data, False, False)
+        encode = time.perf_counter() - start
+        results[name] = {"decode": decode, "encode": encode}
+        _LOGGER.debug("%s - decode %.3fs, encode %.3fs", name, decode, encode)
+    return results
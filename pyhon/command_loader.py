@@ -1,8 +1,10 @@
 import asyncio
+import time
 from contextlib import suppress
 from copy import copy
 from typing import Dict, Any, Optional, TYPE_CHECKING, List
 
+from pyhon import metrics
 from pyhon.commands import HonCommand
 from pyhon.exceptions import NoAuthenticationException
 from pyhon.parameter.fixed import HonParameterFixed
@@ -56,10 +58,13 @@ class HonCommandLoader:
     async def load_commands(self) -> None:
         """Trigger loading of command data"""
         await self._load_data()
+        start = time.perf_counter()
         self._appliance_data = self._api_commands.pop("applianceModel", {})
         self._get_commands()
         self._add_favourites()
         self._recover_last_command_states()
+        seconds = time.perf_counter() - start
+        metrics.registry.observe("pyhon_command_parse_seconds", seconds)
 
     async def _load_commands(self) -> None:
         self._api_commands = await self._api.load_commands(self._appliance)
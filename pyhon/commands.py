@@ -203,6 +203,13 @@ class HonCommand:
                     result[name] = parameter
         return result
 
+    def set_zone(self, zone: int) -> None:
+        for command in self.categories.values():
+            if parameter := command.parameters.get("zoneMap"):
+                parameter.attributes["default"] = zone
+            elif zone_map := command.data.get("zoneMap"):
+                zone_map["default"] = zone
+
     def reset(self) -> None:
         for parameter in self._parameters.values():
             parameter.reset()
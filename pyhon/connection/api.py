@@ -1,25 +1,36 @@
+import asyncio
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from pprint import pformat
 from types import TracebackType
-from typing import Dict, Optional, Any, List, no_type_check, Type
+from typing import Dict, Optional, Any, List, no_type_check, Type, Set, Awaitable
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientError
 from typing_extensions import Self
 
-from pyhon import const, exceptions
+from pyhon import codec, const, exceptions
 from pyhon.appliance import HonAppliance
 from pyhon.connection.auth import HonAuth
+from pyhon.connection.cache import HonCache
 from pyhon.connection.handler.anonym import HonAnonymousConnectionHandler
 from pyhon.connection.handler.hon import HonConnectionHandler
+from pyhon.connection.limiter import HonRateLimiter
+from pyhon.connection.pool import HonConnectionPool, HonPoolConfig
+from pyhon.connection.priority import HonPriority, HonRequestScheduler
+from pyhon.connection.retry import HonRetryPolicy
+from pyhon.connection.store import HonAuthStore
+from pyhon.typedefs import JsonLoads
 
 _LOGGER = logging.getLogger(__name__)
 
 
-# pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-instance-attributes,too-many-arguments
 class HonAPI:
+    # Cached commands younger than this are used without asking the api
+    _COMMANDS_REVALIDATE = 60 * 60  # seconds
+
     def __init__(
         self,
         email: str = "",
@@ -28,6 +39,14 @@ class HonAPI:
         mobile_id: str = "",
         refresh_token: str = "",
         session: Optional[ClientSession] = None,
+        *,
+        cache: Optional[HonCache] = None,
+        auth_store: Optional[HonAuthStore] = None,
+        json_loads: Optional[JsonLoads] = None,
+        pool_config: Optional[HonPoolConfig] = None,
+        retry_policy: Optional[HonRetryPolicy] = None,
+        rate_limiter: Optional[HonRateLimiter] = None,
+        request_scheduler: Optional[HonRequestScheduler] = None,
     ) -> None:
         super().__init__()
         self._email: str = email
@@ -38,6 +57,18 @@ class HonAPI:
         self._hon_handler: Optional[HonConnectionHandler] = None
         self._hon_anonymous_handler: Optional[HonAnonymousConnectionHandler] = None
         self._session: Optional[ClientSession] = session
+        self._cache: Optional[HonCache] = cache
+        self._auth_store: Optional[HonAuthStore] = auth_store
+        self._json_loads: Optional[JsonLoads] = json_loads
+        self._background_tasks: Set[asyncio.Task[None]] = set()
+        self._retry_policy: HonRetryPolicy = retry_policy or HonRetryPolicy()
+        self._rate_limiter: Optional[HonRateLimiter] = rate_limiter
+        self._request_scheduler: HonRequestScheduler = (
+            request_scheduler or HonRequestScheduler()
+        )
+        self._pool: Optional[HonConnectionPool] = None
+        if session is None:
+            self._pool = HonConnectionPool(pool_config)
 
     async def __aenter__(self) -> Self:
         return await self.create()
@@ -56,6 +87,20 @@ class HonAPI:
             raise exceptions.NoAuthenticationException
         return self._hon.auth
 
+    @property
+    def pool(self) -> Optional[HonConnectionPool]:
+        """Connection pool shared by all handlers, None for injected sessions"""
+        return self._pool
+
+    @property
+    def rate_limiter(self) -> Optional[HonRateLimiter]:
+        """Request rate limits shared by all handlers, None if not enabled"""
+        return self._rate_limiter
+
+    @property
+    def request_scheduler(self) -> HonRequestScheduler:
+        return self._request_scheduler
+
     @property
     def _hon(self) -> HonConnectionHandler:
         if self._hon_handler is None:
@@ -70,7 +115,13 @@ class HonAPI:
 
     async def create(self) -> Self:
         self._hon_anonymous_handler = await HonAnonymousConnectionHandler(
-            self._session
+            self._session,
+            cache=self._cache or HonCache(),
+            json_loads=self._json_loads,
+            pool=self._pool,
+            retry_policy=self._retry_policy,
+            rate_limiter=self._rate_limiter,
+            request_scheduler=self._request_scheduler,
         ).create()
         if not self._anonymous:
             self._hon_handler = await HonConnectionHandler(
@@ -79,12 +130,17 @@ class HonAPI:
                 session=self._session,
                 mobile_id=self._mobile_id,
                 refresh_token=self._refresh_token,
+                auth_store=self._auth_store,
+                json_loads=self._json_loads,
+                pool=self._pool,
+                retry_policy=self._retry_policy,
+                rate_limiter=self._rate_limiter,
+                request_scheduler=self._request_scheduler,
             ).create()
         return self
 
     async def load_appliances(self) -> List[Dict[str, Any]]:
-        async with self._hon.get(f"{const.API_URL}/commands/v1/appliance") as resp:
-            result = await resp.json()
+        result = await self._hon.get_json(f"{const.API_URL}/commands/v1/appliance")
         if result:
             appliances: List[Dict[str, Any]] = result.get("payload", {}).get(
                 "appliances", {}
@@ -92,7 +148,8 @@ class HonAPI:
             return appliances
         return []
 
-    async def load_commands(self, appliance: HonAppliance) -> Dict[str, Any]:
+    @staticmethod
+    def _command_params(appliance: HonAppliance) -> Dict[str, str | int]:
         params: Dict[str, str | int] = {
             "applianceType": appliance.appliance_type,
             "applianceModelId": appliance.appliance_model_id,
@@ -107,13 +164,60 @@ class HonAPI:
             params["fwVersion"] = firmware_version
         if series := appliance.info.get("series"):
             params["series"] = series
+        return params
+
+    async def _load_commands(
+        self, params: Dict[str, str | int], priority: HonPriority = HonPriority.STATE
+    ) -> Dict[str, Any]:
         url: str = f"{const.API_URL}/commands/v1/retrieve"
-        async with self._hon.get(url, params=params) as response:
-            result: Dict[str, Any] = (await response.json()).get("payload", {})
-            if not result or result.pop("resultCode") != "0":
-                _LOGGER.error(await response.json())
-                return {}
-            return result
+        data: Dict[str, Any] = await self._hon.get_json(
+            url, params=params, priority=priority
+        )
+        result: Dict[str, Any] = data.get("payload", {})
+        if not result or result.get("resultCode") != "0":
+            _LOGGER.error(data)
+            return {}
+        result.pop("resultCode")
+        return result
+
+    async def _revalidate_commands(
+        self, key: str, params: Dict[str, str | int]
+    ) -> None:
+        if self._cache is None:
+            return
+        try:
+            if result := await self._load_commands(params, HonPriority.BACKGROUND):
+                await self._cache.set("commands", key, result)
+        except (
+            ClientError,
+            asyncio.TimeoutError,
+            exceptions.ApiError,
+            exceptions.HonAuthenticationError,
+        ) as error:
+            _LOGGER.info("Can't revalidate cached commands - %s", error)
+
+    def _create_background_task(self, coroutine: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def load_commands(self, appliance: HonAppliance) -> Dict[str, Any]:
+        params = self._command_params(appliance)
+        if self._cache is None:
+            return await self._load_commands(params)
+        key = self._cache.key({k: v for k, v in params.items() if k != "macAddress"})
+        entry = await self._cache.get("commands", key)
+        if entry is not None and not self._cache.expired(entry):
+            if self._cache.expired(entry, self._COMMANDS_REVALIDATE):
+                self._create_background_task(self._revalidate_commands(key, params))
+            cached: Dict[str, Any] = entry.data
+            return cached
+        if result := await self._load_commands(params):
+            await self._cache.set("commands", key, result)
+        elif entry is not None:
+            _LOGGER.warning("Using expired command cache for %s", appliance.nick_name)
+            result = entry.data
+        return result
 
     async def load_command_history(
         self, appliance: HonAppliance
@@ -121,8 +225,9 @@ class HonAPI:
         url: str = (
             f"{const.API_URL}/commands/v1/appliance/{appliance.mac_address}/history"
         )
-        async with self._hon.get(url) as response:
-            result: Dict[str, Any] = await response.json()
+        result: Dict[str, Any] = await self._hon.get_json(
+            url, priority=HonPriority.BACKGROUND
+        )
         if not result or not result.get("payload"):
             return []
         command_history: List[Dict[str, Any]] = result["payload"]["history"]
@@ -132,8 +237,9 @@ class HonAPI:
         url: str = (
             f"{const.API_URL}/commands/v1/appliance/{appliance.mac_address}/favourite"
         )
-        async with self._hon.get(url) as response:
-            result: Dict[str, Any] = await response.json()
+        result: Dict[str, Any] = await self._hon.get_json(
+            url, priority=HonPriority.BACKGROUND
+        )
         if not result or not result.get("payload"):
             return []
         favourites: List[Dict[str, Any]] = result["payload"]["favourites"]
@@ -142,12 +248,13 @@ class HonAPI:
     async def load_last_activity(self, appliance: HonAppliance) -> Dict[str, Any]:
         url: str = f"{const.API_URL}/commands/v1/retrieve-last-activity"
         params: Dict[str, str] = {"macAddress": appliance.mac_address}
-        async with self._hon.get(url, params=params) as response:
-            result: Dict[str, Any] = await response.json()
-            if result:
-                activity: Dict[str, Any] = result.get("attributes", "")
-                if activity:
-                    return activity
+        result: Dict[str, Any] = await self._hon.get_json(
+            url, params=params, priority=HonPriority.BACKGROUND
+        )
+        if result:
+            activity: Dict[str, Any] = result.get("attributes", "")
+            if activity:
+                return activity
         return {}
 
     async def load_appliance_data(self, appliance: HonAppliance) -> Dict[str, Any]:
@@ -156,13 +263,14 @@ class HonAPI:
             "code": appliance.code,
             "macAddress": appliance.mac_address,
         }
-        async with self._hon.get(url, params=params) as response:
-            result: Dict[str, Any] = await response.json()
-            if result:
-                appliance_data: Dict[str, Any] = result.get("payload", {}).get(
-                    "applianceModel", {}
-                )
-                return appliance_data
+        result: Dict[str, Any] = await self._hon.get_json(
+            url, params=params, priority=HonPriority.BACKGROUND
+        )
+        if result:
+            appliance_data: Dict[str, Any] = result.get("payload", {}).get(
+                "applianceModel", {}
+            )
+            return appliance_data
         return {}
 
     async def load_attributes(self, appliance: HonAppliance) -> Dict[str, Any]:
@@ -172,8 +280,8 @@ class HonAPI:
             "category": "CYCLE",
         }
         url: str = f"{const.API_URL}/commands/v1/context"
-        async with self._hon.get(url, params=params) as response:
-            attributes: Dict[str, Any] = (await response.json()).get("payload", {})
+        result: Dict[str, Any] = await self._hon.get_json(url, params=params)
+        attributes: Dict[str, Any] = result.get("payload", {})
         return attributes
 
     async def load_statistics(self, appliance: HonAppliance) -> Dict[str, Any]:
@@ -182,21 +290,25 @@ class HonAPI:
             "applianceType": appliance.appliance_type,
         }
         url: str = f"{const.API_URL}/commands/v1/statistics"
-        async with self._hon.get(url, params=params) as response:
-            statistics: Dict[str, Any] = (await response.json()).get("payload", {})
+        result: Dict[str, Any] = await self._hon.get_json(
+            url, params=params, priority=HonPriority.BACKGROUND
+        )
+        statistics: Dict[str, Any] = result.get("payload", {})
         return statistics
 
     async def load_maintenance(self, appliance: HonAppliance) -> Dict[str, Any]:
         url = f"{const.API_URL}/commands/v1/maintenance-cycle"
         params = {"macAddress": appliance.mac_address}
-        async with self._hon.get(url, params=params) as response:
-            maintenance: Dict[str, Any] = (await response.json()).get("payload", {})
+        result: Dict[str, Any] = await self._hon.get_json(
+            url, params=params, priority=HonPriority.BACKGROUND
+        )
+        maintenance: Dict[str, Any] = result.get("payload", {})
         return maintenance
 
     async def load_aws_token(self) -> str:
         url: str = f"{const.API_URL}/auth/v1/introspection"
-        async with self._hon.get(url) as response:
-            introspection: Dict[str, Any] = (await response.json()).get("payload", {})
+        data: Dict[str, Any] = await self._hon.get_json(url)
+        introspection: Dict[str, Any] = data.get("payload", {})
         result: str = introspection.get("tokenSigned", "")
         return result
 
@@ -228,18 +340,19 @@ class HonAPI:
         if command == "startProgram" and program_name:
             data.update({"programName": program_name.upper()})
         url: str = f"{const.API_URL}/commands/v1/send"
-        async with self._hon.post(url, json=data) as response:
-            json_data: Dict[str, Any] = await response.json()
-            if json_data.get("payload", {}).get("resultCode") == "0":
-                return True
-            _LOGGER.error(await response.text())
-            _LOGGER.error("%s - Payload:\n%s", url, pformat(data))
+        # Same transactionId on every attempt, the api ignores duplicates
+        json_data: Dict[str, Any] = await self._hon.post_json(
+            url, json=data, idempotent=True, priority=HonPriority.INTERACTIVE
+        )
+        if json_data.get("payload", {}).get("resultCode") == "0":
+            return True
+        _LOGGER.error(json_data)
+        _LOGGER.error("%s - Payload:\n%s", url, pformat(data))
         return False
 
     async def appliance_configuration(self) -> Dict[str, Any]:
         url: str = f"{const.API_URL}/config/v1/program-list-rules"
-        async with self._hon_anonymous.get(url) as response:
-            result: Dict[str, Any] = await response.json()
+        result: Dict[str, Any] = await self._hon_anonymous.get_json(url)
         data: Dict[str, Any] = result.get("payload", {})
         return data
 
@@ -253,9 +366,8 @@ class HonAPI:
             "appVersion": const.APP_VERSION,
             "os": const.OS,
         }
-        payload: str = json.dumps(payload_data, separators=(",", ":"))
-        async with self._hon_anonymous.post(url, data=payload) as response:
-            result = await response.json()
+        payload: str = codec.dumps(payload_data)
+        result = await self._hon_anonymous.post_json(url, data=payload, idempotent=True)
         data: Dict[str, Any] = result.get("payload", {})
         return data
 
@@ -263,15 +375,18 @@ class HonAPI:
         config = await self.app_config(language=language)
         if not (url := config.get("language", {}).get("jsonPath")):
             return {}
-        async with self._hon_anonymous.get(url) as response:
-            result: Dict[str, Any] = await response.json()
+        result: Dict[str, Any] = await self._hon_anonymous.get_json(url)
         return result
 
     async def close(self) -> None:
+        for task in self._background_tasks.copy():
+            task.cancel()
         if self._hon_handler is not None:
             await self._hon_handler.close()
         if self._hon_anonymous_handler is not None:
             await self._hon_anonymous_handler.close()
+        if self._pool is not None:
+            await self._pool.close()
 
 
 class TestAPI(HonAPI):
@@ -285,12 +400,10 @@ class TestAPI(HonAPI):
         if not (path := self._path / directory / f"{file}.json").exists():
             _LOGGER.warning("Can't open %s", str(path))
             return {}
-        with open(path, "r", encoding="utf-8") as json_file:
-            text = json_file.read()
         try:
-            data: Dict[str, Any] = json.loads(text)
+            data: Dict[str, Any] = codec.loads(path.read_bytes())
             return data
-        except json.decoder.JSONDecodeError as error:
+        except json.JSONDecodeError as error:
             _LOGGER.error("%s - %s", str(path), error)
             return {}
 
@@ -298,11 +411,10 @@ class TestAPI(HonAPI):
         result = []
         for appliance in self._path.glob("*/"):
             file = appliance / "appliance_data.json"
-            with open(file, "r", encoding="utf-8") as json_file:
-                try:
-                    result.append(json.loads(json_file.read()))
-                except json.decoder.JSONDecodeError as error:
-                    _LOGGER.error("%s - %s", str(file), error)
+            try:
+                result.append(codec.loads(file.read_bytes()))
+            except json.JSONDecodeError as error:
+                _LOGGER.error("%s - %s", str(file), error)
         return result
 
     async def load_commands(self, appliance: HonAppliance) -> Dict[str, Any]:
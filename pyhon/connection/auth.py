@@ -1,12 +1,13 @@
+import asyncio
 import json
 import logging
 import re
 import secrets
 import urllib
 from contextlib import suppress
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Callable
 from urllib import parse
 from urllib.parse import quote
 
@@ -14,9 +15,11 @@ import aiohttp
 from aiohttp import ClientResponse
 from yarl import URL
 
-from pyhon import const, exceptions
+from pyhon import const, exceptions, metrics
 from pyhon.connection.device import HonDevice
 from pyhon.connection.handler.auth import HonAuthConnectionHandler
+from pyhon.connection.limiter import HonRateLimiter
+from pyhon.connection.store import HonAuthStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,9 +41,12 @@ class HonAuthData:
     id_token: str = ""
 
 
+# pylint: disable=too-many-instance-attributes
 class HonAuth:
     _TOKEN_EXPIRES_AFTER_HOURS = 8
     _TOKEN_EXPIRE_WARNING_HOURS = 7
+    _RENEWAL_MARGIN = 5 * 60  # seconds before expire warning
+    _RENEWAL_RETRY = 60  # seconds
 
     def __init__(
         self,
@@ -48,15 +54,23 @@ class HonAuth:
         email: str,
         password: str,
         device: HonDevice,
+        *,
+        store: Optional[HonAuthStore] = None,
+        rate_limiter: Optional[HonRateLimiter] = None,
     ) -> None:
         self._session = session
-        self._request = HonAuthConnectionHandler(session)
+        self._request = HonAuthConnectionHandler(session, rate_limiter=rate_limiter)
         self._login_data = HonLoginData()
         self._login_data.email = email
         self._login_data.password = password
         self._device = device
         self._expires: datetime = datetime.utcnow()
         self._auth = HonAuthData()
+        self._refresh_task: Optional[asyncio.Task[bool]] = None
+        self._refresh_refused: bool = False
+        self._renewal_task: Optional[asyncio.Task[None]] = None
+        self._token_listeners: List[Callable[[str], None]] = []
+        self._store: HonAuthStore = store or HonAuthStore()
 
     @property
     def cognito_token(self) -> str:
@@ -74,6 +88,18 @@ class HonAuth:
     def refresh_token(self) -> str:
         return self._auth.refresh_token
 
+    @property
+    def token_listeners(self) -> List[Callable[[str], None]]:
+        """Callbacks getting the new id token after every login or refresh"""
+        return self._token_listeners
+
+    @token_listeners.setter
+    def token_listeners(self, listeners: List[Callable[[str], None]]) -> None:
+        self._token_listeners = listeners
+
+    def add_token_listener(self, listener: Callable[[str], None]) -> None:
+        self._token_listeners.append(listener)
+
     def _check_token_expiration(self, hours: int) -> bool:
         return datetime.utcnow() >= self._expires + timedelta(hours=hours)
 
@@ -238,8 +264,9 @@ class HonAuth:
                 return False
         return True
 
-    async def _api_auth(self) -> bool:
-        post_headers = {"id-token": self._auth.id_token}
+    async def _api_auth(self, auth: Optional[HonAuthData] = None) -> bool:
+        auth = auth or self._auth
+        post_headers = {"id-token": auth.id_token}
         data = self._device.get()
         async with self._request.post(
             f"{const.API_URL}/auth/v1/login", headers=post_headers, json=data
@@ -249,8 +276,8 @@ class HonAuth:
             except json.JSONDecodeError:
                 await self._error_logger(response)
                 return False
-            self._auth.cognito_token = json_data.get("cognitoUser", {}).get("Token", "")
-            if not self._auth.cognito_token:
+            auth.cognito_token = json_data.get("cognitoUser", {}).get("Token", "")
+            if not auth.cognito_token:
                 _LOGGER.error(json_data)
                 raise exceptions.HonAuthenticationError()
         return True
@@ -268,26 +295,134 @@ class HonAuth:
                 raise exceptions.HonAuthenticationError("Can't get api token")
         except exceptions.HonNoAuthenticationNeeded:
             return
+        metrics.registry.inc("pyhon_auth_logins_total")
+        await self._token_updated()
+
+    def _on_refresh_done(self, task: "asyncio.Task[bool]") -> None:
+        self._refresh_task = None
+        if not task.cancelled():
+            task.exception()
+
+    def _start_refresh(self, refresh_token: str = "") -> "asyncio.Task[bool]":
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh(refresh_token))
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
 
     async def refresh(self, refresh_token: str = "") -> bool:
-        if refresh_token:
-            self._auth.refresh_token = refresh_token
+        """Refresh tokens, concurrent calls share one refresh"""
+        return await asyncio.shield(self._start_refresh(refresh_token))
+
+    def refresh_in_background(self) -> None:
+        """Start refresh without waiting, current tokens stay valid meanwhile"""
+        self._start_refresh()
+
+    def _start_renewal(self) -> None:
+        if self._renewal_task is None or self._renewal_task.done():
+            self._renewal_task = asyncio.create_task(self._renewal())
+
+    async def _token_updated(self) -> None:
+        self._start_renewal()
+        for listener in self._token_listeners:
+            listener(self._auth.id_token)
+        await self._store.save(self._login_data.email, self._export_session())
+
+    def _auth_cookies(self) -> List[Dict[str, str]]:
+        host = parse.urlparse(const.AUTH_API).hostname or ""
+        return [
+            {"name": cookie.key, "value": cookie.value, "path": cookie["path"]}
+            for cookie in self._session.cookie_jar
+            # Shared sessions hold cookies of other sites too, keep them out
+            if cookie["domain"]
+            and f".{host}".endswith(f".{cookie['domain'].lstrip('.')}")
+        ]
+
+    def _export_session(self) -> Dict[str, Any]:
+        return {
+            "auth": asdict(self._auth),
+            "expires": self._expires.isoformat(),
+            "cookies": self._auth_cookies(),
+        }
+
+    async def restore_session(self) -> bool:
+        """Restore tokens and auth cookies of the last session from the store"""
+        if not (data := await self._store.load(self._login_data.email)):
+            return False
+        try:
+            self._auth = HonAuthData(**data["auth"])
+            self._expires = datetime.fromisoformat(data["expires"])
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.warning("Can't restore auth session - %s", error)
+            await self._store.delete(self._login_data.email)
+            return False
+        for cookie in data.get("cookies", []):
+            url = URL(const.AUTH_API).with_path(cookie.get("path") or "/")
+            self._session.cookie_jar.update_cookies(
+                {cookie["name"]: cookie["value"]}, response_url=url
+            )
+        if not self.token_is_expired:
+            self._start_renewal()
+        return bool(self._auth.refresh_token)
+
+    async def _renewal(self) -> None:
+        """Refresh tokens shortly before they are considered as expiring"""
+        delay: float = 0
+        while True:
+            renew_at = self._expires + timedelta(
+                hours=self._TOKEN_EXPIRE_WARNING_HOURS, seconds=-self._RENEWAL_MARGIN
+            )
+            delay = max((renew_at - datetime.utcnow()).total_seconds(), delay)
+            await asyncio.sleep(delay)
+            try:
+                renewed = await self.refresh()
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                exceptions.ApiError,
+                exceptions.HonAuthenticationError,
+            ) as error:
+                _LOGGER.warning("Token renewal failed - %s", error)
+                renewed = False
+            if not renewed and self._refresh_refused:
+                # Retrying a rejected token is pointless, next request logs in again
+                _LOGGER.warning("Refresh token rejected, stop token renewal")
+                return
+            delay = 0 if renewed else self._RENEWAL_RETRY
+
+    async def _refresh(self, refresh_token: str = "") -> bool:
+        self._refresh_refused = False
+        auth = replace(self._auth, refresh_token=refresh_token or self.refresh_token)
         params = {
             "client_id": const.CLIENT_ID,
-            "refresh_token": self._auth.refresh_token,
+            "refresh_token": auth.refresh_token,
             "grant_type": "refresh_token",
         }
         async with self._request.post(
             f"{const.AUTH_API}/services/oauth2/token", params=params
         ) as response:
+            self._refresh_refused = 400 <= response.status < 500
             if response.status >= 400:
                 await self._error_logger(response, fail=False)
+                metrics.registry.inc("pyhon_auth_refreshes_total", result="failure")
                 return False
             data = await response.json()
-        self._expires = datetime.utcnow()
-        self._auth.id_token = data["id_token"]
-        self._auth.access_token = data["access_token"]
-        return await self._api_auth()
+        expires = datetime.utcnow()
+        auth.id_token = data["id_token"]
+        auth.access_token = data["access_token"]
+        # Requests continue meanwhile, only switch to a complete set of tokens
+        if not await self._api_auth(auth):
+            metrics.registry.inc("pyhon_auth_refreshes_total", result="failure")
+            return False
+        self._auth, self._expires = auth, expires
+        metrics.registry.inc("pyhon_auth_refreshes_total", result="success")
+        await self._token_updated()
+        return True
+
+    async def close(self) -> None:
+        tasks = [t for t in (self._renewal_task, self._refresh_task) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     def clear(self) -> None:
         self._session.cookie_jar.clear_domain(const.AUTH_API.split("/")[-2])
@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from copy import deepcopy
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from pyhon import codec, const
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_VERSION = f"1-{const.APP_VERSION}"
+
+
+@dataclass
+class HonCacheEntry:
+    data: Any
+    created: float = 0.0
+    version: str = CACHE_VERSION
+    etag: str = ""
+    last_modified: str = ""
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created
+
+
+class HonCache:
+    """In-memory cache for api payloads"""
+
+    _DEFAULT_TTL = 24 * 60 * 60  # seconds
+
+    def __init__(self, ttl: float = _DEFAULT_TTL, version: str = CACHE_VERSION):
+        self._ttl: float = ttl
+        self._version: str = version
+        self._entries: Dict[Tuple[str, str], HonCacheEntry] = {}
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    @staticmethod
+    def key(data: Dict[str, Any]) -> str:
+        """Stable key for a dict of request parameters"""
+        dump = json.dumps(data, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(dump.encode()).hexdigest()
+
+    def expired(self, entry: HonCacheEntry, ttl: Optional[float] = None) -> bool:
+        return entry.age > (self._ttl if ttl is None else ttl)
+
+    async def get(self, namespace: str, key: str) -> Optional[HonCacheEntry]:
+        """Get entry of current cache version, expired entries included"""
+        if (entry := self._entries.get((namespace, key))) is None:
+            return None
+        if entry.version != self._version:
+            await self.delete(namespace, key)
+            return None
+        # Kept for further calls, callers may modify their copy
+        return replace(entry, data=deepcopy(entry.data))
+
+    async def set(
+        self,
+        namespace: str,
+        key: str,
+        data: Any,
+        etag: str = "",
+        last_modified: str = "",
+    ) -> None:
+        entry = HonCacheEntry(
+            deepcopy(data), time.time(), self._version, etag, last_modified
+        )
+        self._entries[(namespace, key)] = entry
+
+    async def touch(self, namespace: str, key: str) -> None:
+        """Mark entry as fresh again, e.g. after a successful revalidation"""
+        if entry := self._entries.get((namespace, key)):
+            entry.created = time.time()
+
+    async def delete(self, namespace: str, key: str) -> None:
+        self._entries.pop((namespace, key), None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class HonFileCache(HonCache):
+    """Cache persisted as json files
+
+    Payloads are parsed on every get instead of being kept in memory, a parse
+    is cheaper than copying a shared entry for each caller.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float = HonCache._DEFAULT_TTL,
+        version: str = CACHE_VERSION,
+    ):
+        super().__init__(ttl=ttl, version=version)
+        self._path: Path = path
+
+    def _file(self, namespace: str, key: str) -> Path:
+        return self._path / namespace / f"{key}.json"
+
+    def _read(self, file: Path) -> Optional[HonCacheEntry]:
+        if not file.exists():
+            return None
+        try:
+            return HonCacheEntry(**codec.loads(file.read_bytes()))
+        except (OSError, TypeError, json.JSONDecodeError) as error:
+            _LOGGER.warning("Can't read cache %s - %s", str(file), error)
+            return None
+
+    def _write(self, file: Path, entry: HonCacheEntry) -> None:
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = file.with_suffix(".tmp")
+            temp_file.write_bytes(codec.dumpb(vars(entry)))
+            temp_file.replace(file)
+        except OSError as error:
+            _LOGGER.warning("Can't write cache %s - %s", str(file), error)
+
+    def _touch(self, file: Path) -> None:
+        if (entry := self._read(file)) is not None:
+            entry.created = time.time()
+            self._write(file, entry)
+
+    async def get(self, namespace: str, key: str) -> Optional[HonCacheEntry]:
+        file = self._file(namespace, key)
+        if (entry := await asyncio.to_thread(self._read, file)) is None:
+            return None
+        if entry.version != self._version:
+            await self.delete(namespace, key)
+            return None
+        return entry
+
+    async def set(
+        self,
+        namespace: str,
+        key: str,
+        data: Any,
+        etag: str = "",
+        last_modified: str = "",
+    ) -> None:
+        entry = HonCacheEntry(data, time.time(), self._version, etag, last_modified)
+        # Written before returning, callers may modify data afterwards
+        await asyncio.to_thread(self._write, self._file(namespace, key), entry)
+
+    async def touch(self, namespace: str, key: str) -> None:
+        await asyncio.to_thread(self._touch, self._file(namespace, key))
+
+    async def delete(self, namespace: str, key: str) -> None:
+        await super().delete(namespace, key)
+        self._file(namespace, key).unlink(missing_ok=True)
+
+    async def clear(self) -> None:
+        await super().clear()
+        for file in self._path.glob("*/*.json"):
+            file.unlink(missing_ok=True)
@@ -1,12 +1,14 @@
+import asyncio
 import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import aiohttp
 from yarl import URL
 
-from pyhon import const
+from pyhon import const, exceptions
+from pyhon.connection.cache import HonCache, HonCacheEntry
 from pyhon.connection.handler.base import ConnectionHandler
 from pyhon.typedefs import Callback
 
@@ -15,6 +17,18 @@ _LOGGER = logging.getLogger(__name__)
 
 class HonAnonymousConnectionHandler(ConnectionHandler):
     _HEADERS: Dict[str, str] = ConnectionHandler._HEADERS | {"x-api-key": const.API_KEY}
+    _CACHE_NAMESPACE = "anonymous"
+    _CACHEABLE = {"params", "data", "priority", "idempotent"}
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        *,
+        cache: Optional[HonCache] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(session, **kwargs)
+        self._cache: Optional[HonCache] = cache
 
     @asynccontextmanager
     async def _intercept(
@@ -25,3 +39,68 @@ class HonAnonymousConnectionHandler(ConnectionHandler):
             if response.status == 403:
                 _LOGGER.error("Can't authenticate anymore")
             yield response
+
+    def _cache_key(self, method: str, url: str | URL, kwargs: Dict[str, Any]) -> str:
+        if self._cache is None or set(kwargs) - self._CACHEABLE:
+            return ""
+        if not isinstance(data := kwargs.get("data", ""), str):
+            return ""
+        params = kwargs.get("params") or {}
+        request = {"method": method, "url": str(url), "params": params, "data": data}
+        return self._cache.key(request)
+
+    async def _revalidate(
+        self,
+        cache: HonCache,
+        key: str,
+        entry: Optional[HonCacheEntry],
+        method: str,
+        url: str | URL,
+        **kwargs: Any,
+    ) -> Any:
+        headers: Dict[str, str] = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        request = self.post if method == "post" else self.get
+        async with request(url, headers=headers, **kwargs) as response:
+            if response.status == 304 and entry is not None:
+                await cache.touch(self._CACHE_NAMESPACE, key)
+                return entry.data
+            data = await self._decode(response)
+            if response.status == 200 and data:
+                etag = response.headers.get("ETag", "")
+                last_modified = response.headers.get("Last-Modified", "")
+                await cache.set(self._CACHE_NAMESPACE, key, data, etag, last_modified)
+            return data
+
+    async def _cached_json(
+        self, cache: HonCache, key: str, method: str, url: str | URL, **kwargs: Any
+    ) -> Any:
+        """Serve fresh entries from cache, revalidate the others conditionally"""
+        entry = await cache.get(self._CACHE_NAMESPACE, key)
+        if entry is not None and not cache.expired(entry):
+            return entry.data
+        try:
+            return await self._revalidate(cache, key, entry, method, url, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError, exceptions.ApiError) as err:
+            if entry is None:
+                raise
+            _LOGGER.warning("Using expired cache for %s - %s", url, err)
+            return entry.data
+
+    async def _get_json(self, url: str | URL, **kwargs: Any) -> Any:
+        if self._cache is None or not (key := self._cache_key("get", url, kwargs)):
+            return await super()._get_json(url, **kwargs)
+        return await self._cached_json(self._cache, key, "get", url, **kwargs)
+
+    async def post_json(self, url: str | URL, **kwargs: Any) -> Any:
+        """Post request, cached only if marked as idempotent"""
+        if (
+            self._cache is None
+            or not kwargs.get("idempotent")
+            or not (key := self._cache_key("post", url, kwargs))
+        ):
+            return await super().post_json(url, **kwargs)
+        return await self._cached_json(self._cache, key, "post", url, **kwargs)
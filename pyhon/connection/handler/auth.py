@@ -8,6 +8,7 @@ from yarl import URL
 
 from pyhon import const
 from pyhon.connection.handler.base import ConnectionHandler
+from pyhon.connection.limiter import HonRateLimiter
 from pyhon.typedefs import Callback
 
 _LOGGER = logging.getLogger(__name__)
@@ -16,8 +17,13 @@ _LOGGER = logging.getLogger(__name__)
 class HonAuthConnectionHandler(ConnectionHandler):
     _HEADERS = {"user-agent": const.USER_AGENT}
 
-    def __init__(self, session: Optional[aiohttp.ClientSession] = None) -> None:
-        super().__init__(session)
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        *,
+        rate_limiter: Optional[HonRateLimiter] = None,
+    ) -> None:
+        super().__init__(session, rate_limiter=rate_limiter)
         self._called_urls: List[Tuple[int, str]] = []
 
     @property
@@ -1,28 +1,58 @@
+import asyncio
 import logging
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+import time
+from collections.abc import AsyncIterator, Hashable
+from contextlib import (
+    AbstractAsyncContextManager,
+    AsyncExitStack,
+    asynccontextmanager,
+    nullcontext,
+)
+from copy import deepcopy
 from types import TracebackType
-from typing import Optional, Dict, Type, Any
+from typing import Optional, Dict, List, Type, Any
 
 import aiohttp
 from typing_extensions import Self
 from yarl import URL
 
-from pyhon import const, exceptions
-from pyhon.typedefs import Callback
+from pyhon import codec, const, exceptions, metrics
+from pyhon.connection.limiter import HonRateLimiter
+from pyhon.connection.pool import HonConnectionPool
+from pyhon.connection.priority import HonPriority, HonRequestScheduler
+from pyhon.connection.retry import HonRetryPolicy
+from pyhon.connection.tracing import HonTracer, endpoint
+from pyhon.typedefs import Callback, JsonLoads
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# pylint: disable=too-many-instance-attributes
 class ConnectionHandler:
     _HEADERS: Dict[str, str] = {
         "user-agent": const.USER_AGENT,
         "Content-Type": "application/json",
     }
 
-    def __init__(self, session: Optional[aiohttp.ClientSession] = None) -> None:
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        *,
+        json_loads: Optional[JsonLoads] = None,
+        pool: Optional[HonConnectionPool] = None,
+        retry_policy: Optional[HonRetryPolicy] = None,
+        rate_limiter: Optional[HonRateLimiter] = None,
+        request_scheduler: Optional[HonRequestScheduler] = None,
+    ) -> None:
         self._create_session: bool = session is None
         self._session: Optional[aiohttp.ClientSession] = session
+        self._pool: Optional[HonConnectionPool] = pool
+        self._retry_policy: HonRetryPolicy = retry_policy or HonRetryPolicy()
+        self._rate_limiter: Optional[HonRateLimiter] = rate_limiter
+        self._request_scheduler: Optional[HonRequestScheduler] = request_scheduler
+        self._json_loads: JsonLoads = json_loads or codec.loads
+        self._in_flight: Dict[Hashable, asyncio.Future[List[Any]]] = {}
+        self._joined: Dict[Hashable, int] = {}
 
     async def __aenter__(self) -> Self:
         return await self.create()
@@ -43,7 +73,11 @@ class ConnectionHandler:
 
     async def create(self) -> Self:
         if self._create_session:
-            self._session = aiohttp.ClientSession()
+            if self._pool is not None:
+                self._session = self._pool.session()
+            else:
+                trace_configs = [HonTracer().trace_config()]
+                self._session = aiohttp.ClientSession(trace_configs=trace_configs)
         return self
 
     @asynccontextmanager
@@ -53,6 +87,88 @@ class ConnectionHandler:
         async with method(url, *args, **kwargs) as response:
             yield response
 
+    async def _backoff(self, url: str | URL, attempt: int, reason: Any) -> None:
+        retry_after = ""
+        if isinstance(reason, aiohttp.ClientResponse):
+            retry_after = reason.headers.get("Retry-After", "")
+            reason = f"status {reason.status}"
+        delay = self._retry_policy.delay(attempt, retry_after)
+        metrics.registry.inc("pyhon_http_retries_total", endpoint=endpoint(url))
+        _LOGGER.info("%s - %s, retry in %.1fs", url, reason, delay)
+        await asyncio.sleep(delay)
+
+    async def _admit(self, url: str | URL, host: str, priority: HonPriority) -> None:
+        """Fail fast on open circuits and wait for the rate limit"""
+        if not self._retry_policy.breaker.allow(host):
+            raise exceptions.ApiError(f"Circuit open for {host}")
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire(url, priority)
+
+    def _retryable(self, host: str, response: aiohttp.ClientResponse) -> bool:
+        if response.status >= 500:
+            self._retry_policy.breaker.failure(host)
+        else:
+            self._retry_policy.breaker.success(host)
+        return response.status in self._retry_policy.statuses
+
+    def _slot(self, priority: HonPriority) -> AbstractAsyncContextManager[None]:
+        if self._request_scheduler is None:
+            return nullcontext()
+        return self._request_scheduler.slot(priority)
+
+    @asynccontextmanager
+    async def _attempt(
+        self, method: Callback, url: str | URL, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        method_name = getattr(method, "__name__", "").upper()
+        labels: Dict[str, str] = {"endpoint": endpoint(url), "method": method_name}
+        start = time.monotonic()
+        try:
+            async with self._intercept(method, url, *args, **kwargs) as response:
+                status = str(response.status)
+                metrics.registry.inc(
+                    "pyhon_http_requests_total", status=status, **labels
+                )
+                yield response
+        except Exception as error:
+            error_labels = labels | {"error": type(error).__name__}
+            metrics.registry.inc("pyhon_http_errors_total", **error_labels)
+            raise
+        seconds = time.monotonic() - start
+        metrics.registry.observe("pyhon_http_request_seconds", seconds, **labels)
+
+    @asynccontextmanager
+    async def _retry(
+        self,
+        method: Callback,
+        url: str | URL,
+        *args: Any,
+        idempotent: bool = True,
+        priority: HonPriority = HonPriority.STATE,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Retry idempotent requests on connection errors and server errors"""
+        host = URL(str(url)).host or ""
+        attempts = max(self._retry_policy.attempts, 1) if idempotent else 1
+        for attempt in range(attempts):
+            await self._admit(url, host, priority)
+            async with self._slot(priority), AsyncExitStack() as stack:
+                try:
+                    response = await stack.enter_async_context(
+                        self._attempt(method, url, *args, **kwargs)
+                    )
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                    self._retry_policy.breaker.failure(host)
+                    if attempt + 1 >= attempts:
+                        raise
+                    reason: Any = repr(error)
+                else:
+                    if not self._retryable(host, response) or attempt + 1 >= attempts:
+                        yield response
+                        return
+                    reason = response
+            await self._backoff(url, attempt, reason)
+
     @asynccontextmanager
     async def get(
         self, *args: Any, **kwargs: Any
@@ -60,21 +176,85 @@ class ConnectionHandler:
         if self._session is None:
             raise exceptions.NoSessionException()
         response: aiohttp.ClientResponse
-        args = self._session.get, *args
-        async with self._intercept(*args, **kwargs) as response:
+        kwargs.setdefault("idempotent", True)
+        async with self._retry(self._session.get, *args, **kwargs) as response:
             yield response
 
     @asynccontextmanager
     async def post(
         self, *args: Any, **kwargs: Any
     ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Post request, only retried if marked as idempotent"""
         if self._session is None:
             raise exceptions.NoSessionException()
         response: aiohttp.ClientResponse
-        args = self._session.post, *args
-        async with self._intercept(*args, **kwargs) as response:
+        kwargs.setdefault("idempotent", False)
+        async with self._retry(self._session.post, *args, **kwargs) as response:
             yield response
 
+    async def _decode(self, response: aiohttp.ClientResponse) -> Any:
+        """Parse json body, None for empty responses"""
+        if response.status >= 500:
+            raise exceptions.ApiError(
+                f"{response.request_info.url} - Server error {response.status}"
+            )
+        if not (body := (await response.read()).strip()):
+            return None
+        return self._json_loads(body)
+
+    async def _get_json(self, url: str | URL, **kwargs: Any) -> Any:
+        async with self.get(url, **kwargs) as response:
+            return await self._decode(response)
+
+    @staticmethod
+    def _flight_key(url: str | URL, kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        if set(kwargs) - {"params", "headers", "priority"}:
+            return None
+        params = tuple(sorted((kwargs.get("params") or {}).items()))
+        headers = tuple(sorted((kwargs.get("headers") or {}).items()))
+        return str(url), params, headers
+
+    async def _shared_get_json(
+        self, key: Hashable, url: str | URL, **kwargs: Any
+    ) -> List[Any]:
+        """Result for the first caller, followed by a copy per joined caller"""
+        try:
+            result = await self._get_json(url, **kwargs)
+        finally:
+            # Nobody can join anymore, the number of copies is final
+            self._in_flight.pop(key, None)
+            joined = self._joined.pop(key, 0)
+        # Copied before anyone resumes, so the first caller may mutate its result
+        return [result, *(deepcopy(result) for _ in range(joined))]
+
+    @staticmethod
+    def _on_flight_done(future: asyncio.Future[List[Any]]) -> None:
+        if not future.cancelled():
+            future.exception()  # retrieved, even if no caller is left
+
+    async def get_json(self, url: str | URL, **kwargs: Any) -> Any:
+        """Request and return the decoded body, parsed only once
+
+        Identical concurrent requests share one network request, callers
+        joining a running request get their own copy of the result.
+        """
+        if (key := self._flight_key(url, kwargs)) is None:
+            return await self._get_json(url, **kwargs)
+        if (future := self._in_flight.get(key)) is not None:
+            _LOGGER.debug("%s - joined in-flight request", url)
+            self._joined[key] += 1
+            index = self._joined[key]
+        else:
+            self._joined[key] = index = 0
+            future = asyncio.ensure_future(self._shared_get_json(key, url, **kwargs))
+            self._in_flight[key] = future
+            future.add_done_callback(self._on_flight_done)
+        return (await asyncio.shield(future))[index]
+
+    async def post_json(self, url: str | URL, **kwargs: Any) -> Any:
+        async with self.post(url, **kwargs) as response:
+            return await self._decode(response)
+
     async def close(self) -> None:
         if self._create_session and self._session is not None:
             await self._session.close()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from collections.abc import AsyncIterator
@@ -10,14 +11,20 @@ from yarl import URL
 
 from pyhon.connection.auth import HonAuth
 from pyhon.connection.device import HonDevice
+from pyhon.connection.limiter import HonRateLimiter
+from pyhon.connection.pool import HonConnectionPool
+from pyhon.connection.priority import HonRequestScheduler
+from pyhon.connection.retry import HonRetryPolicy
+from pyhon.connection.store import HonAuthStore, HonFileAuthStore
 from pyhon.connection.handler.base import ConnectionHandler
 from pyhon.exceptions import HonAuthenticationError, NoAuthenticationException
-from pyhon.typedefs import Callback
+from pyhon.typedefs import Callback, JsonLoads
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class HonConnectionHandler(ConnectionHandler):
+    # pylint: disable=too-many-arguments
     def __init__(
         self,
         email: str,
@@ -25,8 +32,22 @@ class HonConnectionHandler(ConnectionHandler):
         session: Optional[aiohttp.ClientSession] = None,
         mobile_id: str = "",
         refresh_token: str = "",
+        *,
+        auth_store: Optional[HonAuthStore] = None,
+        json_loads: Optional[JsonLoads] = None,
+        pool: Optional[HonConnectionPool] = None,
+        retry_policy: Optional[HonRetryPolicy] = None,
+        rate_limiter: Optional[HonRateLimiter] = None,
+        request_scheduler: Optional[HonRequestScheduler] = None,
     ) -> None:
-        super().__init__(session=session)
+        super().__init__(
+            session=session,
+            json_loads=json_loads,
+            pool=pool,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            request_scheduler=request_scheduler,
+        )
         self._device: HonDevice = HonDevice(mobile_id)
         self._email: str = email
         self._password: str = password
@@ -36,6 +57,8 @@ class HonConnectionHandler(ConnectionHandler):
         if not self._password:
             raise HonAuthenticationError("A password address must be specified")
         self._auth: Optional[HonAuth] = None
+        self._auth_lock = asyncio.Lock()
+        self._auth_store: HonAuthStore = auth_store or HonFileAuthStore()
 
     @property
     def auth(self) -> HonAuth:
@@ -49,20 +72,38 @@ class HonConnectionHandler(ConnectionHandler):
 
     async def create(self) -> Self:
         await super().create()
+        previous = self._auth
         self._auth = HonAuth(
             self.session,
             self._email,
             self._password,
             self._device,
+            store=self._auth_store,
+            rate_limiter=self._rate_limiter,
         )
+        if previous is not None:
+            self._auth.token_listeners = previous.token_listeners
+            await previous.close()
+        elif await self._auth.restore_session() and not self._refresh_token:
+            self._refresh_token = self._auth.refresh_token
         return self
 
+    async def _check_auth(self) -> None:
+        async with self._auth_lock:
+            if (
+                not (self.auth.cognito_token and self.auth.id_token)
+                or self.auth.token_is_expired
+            ):
+                if not (
+                    self._refresh_token and await self.auth.refresh(self._refresh_token)
+                ):
+                    await self.auth.authenticate()
+            elif self.auth.token_expires_soon:
+                self.auth.refresh_in_background()
+            self._refresh_token = self.auth.refresh_token
+
     async def _check_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
-        if self._refresh_token:
-            await self.auth.refresh(self._refresh_token)
-        if not (self.auth.cognito_token and self.auth.id_token):
-            await self.auth.authenticate()
-        self._refresh_token = self.auth.refresh_token
+        await self._check_auth()
         headers["cognito-token"] = self.auth.cognito_token
         headers["id-token"] = self.auth.id_token
         return self._HEADERS | headers
@@ -74,9 +115,7 @@ class HonConnectionHandler(ConnectionHandler):
         loop: int = kwargs.pop("loop", 0)
         kwargs["headers"] = await self._check_headers(kwargs.get("headers", {}))
         async with method(url, *args, **kwargs) as response:
-            if (
-                self.auth.token_expires_soon or response.status in [401, 403]
-            ) and loop == 0:
+            if response.status in [401, 403] and loop == 0:
                 _LOGGER.info("Try refreshing token...")
                 await self.auth.refresh(self._refresh_token)
                 async with self._intercept(
@@ -106,14 +145,21 @@ class HonConnectionHandler(ConnectionHandler):
                 )
                 raise HonAuthenticationError("Login failure")
             else:
-                try:
-                    await response.json()
-                    yield response
-                except json.JSONDecodeError as exc:
-                    _LOGGER.warning(
-                        "%s - JsonDecodeError %s - %s",
-                        response.request_info.url,
-                        response.status,
-                        await response.text(),
-                    )
-                    raise HonAuthenticationError("Decode Error") from exc
+                yield response
+
+    async def _decode(self, response: aiohttp.ClientResponse) -> Any:
+        try:
+            return await super()._decode(response)
+        except json.JSONDecodeError as exc:
+            _LOGGER.warning(
+                "%s - JsonDecodeError %s - %s",
+                response.request_info.url,
+                response.status,
+                await response.text(),
+            )
+            raise HonAuthenticationError("Decode Error") from exc
+
+    async def close(self) -> None:
+        if self._auth is not None:
+            await self._auth.close()
+        await super().close()
@@ -0,0 +1,135 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from yarl import URL
+
+from pyhon import const
+from pyhon.connection.priority import HonPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HonTokenBucket:
+    """Token bucket, waiting callers are served by priority, then arrival"""
+
+    def __init__(self, rate: float, capacity: float = 1) -> None:
+        self._rate: float = rate  # tokens per second
+        self._capacity: float = max(capacity, 1)
+        self._tokens: float = self._capacity
+        self._updated: float = time.monotonic()
+        self._waiters: List[Tuple[int, int, float, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def _wake(self) -> None:
+        self._timer = None
+        self._refill()
+        while self._waiters:
+            *_, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < tokens:
+                delay = (tokens - self._tokens) / self._rate
+                self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+                return
+            heapq.heappop(self._waiters)
+            self._tokens -= tokens
+            future.set_result(None)
+
+    async def acquire(self, tokens: float = 1, priority: int = 0) -> float:
+        """Take tokens, wait until available and return the waited seconds"""
+        start = time.monotonic()
+        self._refill()
+        if not self._waiters and self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), tokens, future))
+        if self._timer is None:
+            self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Tokens granted right before the cancellation go back
+            if not future.cancelled():
+                self._tokens += tokens
+            raise
+        return time.monotonic() - start
+
+
+@dataclass(frozen=True)
+class HonRateLimit:
+    requests_per_minute: float
+    burst: float = 1
+
+
+class HonRateLimiter:
+    """Token buckets per endpoint family, shared by all handlers of an api"""
+
+    DEFAULT_LIMITS: Dict[str, HonRateLimit] = {
+        "auth": HonRateLimit(30, 15),
+        "commands": HonRateLimit(120, 30),
+        "statistics": HonRateLimit(60, 20),
+        "send": HonRateLimit(30, 10),
+    }
+
+    def __init__(self, limits: Optional[Dict[str, HonRateLimit]] = None) -> None:
+        self._buckets: Dict[str, HonTokenBucket] = {
+            family: HonTokenBucket(limit.requests_per_minute / 60, limit.burst)
+            for family, limit in (self.DEFAULT_LIMITS | (limits or {})).items()
+        }
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def family(url: str | URL) -> str:
+        url = URL(str(url))
+        if f"https://{url.host}" == const.AUTH_API or url.path.startswith("/auth/"):
+            return "auth"
+        if url.path.endswith("/send"):
+            return "send"
+        if url.path.endswith(("/statistics", "/maintenance-cycle")):
+            return "statistics"
+        return "commands"
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Requests and waited seconds per endpoint family"""
+        return {family: stats.copy() for family, stats in self._stats.items()}
+
+    async def acquire(
+        self, url: str | URL, priority: HonPriority = HonPriority.STATE
+    ) -> float:
+        family = self.family(url)
+        if (bucket := self._buckets.get(family)) is None:
+            return 0.0
+        waited = await bucket.acquire(priority=priority)
+        stats = self._stats.setdefault(
+            family, {"requests": 0, "waited": 0.0, "max_wait": 0.0}
+        )
+        stats["requests"] += 1
+        stats["waited"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+        if waited > 0.1:
+            _LOGGER.debug("%s - rate limited for %.1fs", family, waited)
+        return waited
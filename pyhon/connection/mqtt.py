@@ -1,13 +1,15 @@
 import asyncio
-import json
+import concurrent.futures
 import logging
 import secrets
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
 
 from awscrt import mqtt5
 from awsiot import mqtt5_client_builder  # type: ignore[import-untyped]
 
-from pyhon import const
+from pyhon import codec, const, metrics
 from pyhon.appliance import HonAppliance
 
 if TYPE_CHECKING:
@@ -15,9 +17,29 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+Message = Tuple[str, bytes]
 
+
+@dataclass
+class HonMqttConfig:
+    """Queue between the awscrt callback thread and the event loop"""
+
+    queue_size: int = 1000
+    batch_size: int = 100
+    # What to do with a full queue: drop_oldest, drop_newest or block
+    backpressure: str = "drop_oldest"
+    block_timeout: float = 10  # seconds, dropped afterwards
+
+    def __post_init__(self) -> None:
+        if self.backpressure not in ("drop_oldest", "drop_newest", "block"):
+            raise ValueError(f"Unknown backpressure {self.backpressure}")
+
+
+# pylint: disable=too-many-instance-attributes
 class MQTTClient:
-    def __init__(self, hon: "Hon", mobile_id: str) -> None:
+    def __init__(
+        self, hon: "Hon", mobile_id: str, config: Optional[HonMqttConfig] = None
+    ) -> None:
         self._client: mqtt5.Client | None = None
         self._hon = hon
         self._mobile_id = mobile_id or const.MOBILE_ID
@@ -25,6 +47,19 @@ class MQTTClient:
         self._appliances = hon.appliances
         self._connection = False
         self._watchdog_task: asyncio.Task[None] | None = None
+        self._restart_task: asyncio.Task[None] | None = None
+        self._restart_lock = asyncio.Lock()
+        self._stopped = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._topic_index: Dict[str, List[HonAppliance]] = {}
+        self._config: HonMqttConfig = config or HonMqttConfig()
+        self._queue: asyncio.Queue[Message] = asyncio.Queue(
+            max(self._config.queue_size, 1)
+        )
+        self._consumer_task: asyncio.Task[None] | None = None
+        self._overflow = False
+        self._closing = False
+        self._blocked: Set[concurrent.futures.Future[None]] = set()
 
     @property
     def client(self) -> mqtt5.Client:
@@ -33,21 +68,51 @@ class MQTTClient:
         raise AttributeError("Client is not set")
 
     async def create(self) -> "MQTTClient":
+        self._loop = asyncio.get_running_loop()
+        self._consumer_task = asyncio.create_task(self._consume())
         await self._start()
-        self._subscribe_appliances()
+        await self._subscribe_appliances()
         await self.start_watchdog()
+        self._api.auth.add_token_listener(self._on_token_update)
         return self
 
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def _call_soon(self, callback: Callable[..., None], *args: Any) -> None:
+        """Run on the event loop, awscrt calls back from its own threads"""
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            _LOGGER.debug("Event loop closed, ignore mqtt callback")
+
+    def _set_connected(self) -> None:
+        self._connection = True
+
+    def _set_disconnected(self) -> None:
+        self._connection = False
+        # Missed messages can't be recovered, make appliances poll again
+        for appliance in self._appliances:
+            appliance.last_mqtt_update = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connection
+
     def _on_lifecycle_stopped(
         self, lifecycle_stopped_data: mqtt5.LifecycleStoppedData
     ) -> None:
         _LOGGER.info("Lifecycle Stopped: %s", str(lifecycle_stopped_data))
+        self._call_soon(self._stopped.set)
 
     def _on_lifecycle_connection_success(
         self,
         lifecycle_connect_success_data: mqtt5.LifecycleConnectSuccessData,
     ) -> None:
-        self._connection = True
+        self._call_soon(self._set_connected)
         _LOGGER.info(
             "Lifecycle Connection Success: %s", str(lifecycle_connect_success_data)
         )
@@ -64,7 +129,7 @@ class MQTTClient:
         self,
         lifecycle_connection_failure_data: mqtt5.LifecycleConnectFailureData,
     ) -> None:
-        self._connection = False
+        self._call_soon(self._set_disconnected)
         _LOGGER.info(
             "Lifecycle Connection Failure - %s", str(lifecycle_connection_failure_data)
         )
@@ -73,38 +138,148 @@ class MQTTClient:
         self,
         lifecycle_disconnect_data: mqtt5.LifecycleDisconnectData,
     ) -> None:
-        self._connection = False
+        self._call_soon(self._set_disconnected)
         _LOGGER.info("Lifecycle Disconnection - %s", str(lifecycle_disconnect_data))
 
-    def _on_publish_received(self, data: mqtt5.PublishReceivedData) -> None:
-        if not (data and data.publish_packet and data.publish_packet.payload):
-            return
-        payload = json.loads(data.publish_packet.payload.decode())
-        topic = data.publish_packet.topic
-        appliance = next(
-            a for a in self._appliances if topic in a.info["topics"]["subscribe"]
+    @staticmethod
+    def _update_parameters(
+        appliance: HonAppliance, payload: Dict[str, Any]
+    ) -> Set[str]:
+        metrics.registry.inc(
+            "pyhon_attributes_updated_total",
+            len(payload["parameters"]),
+            source="mqtt",
         )
-        if topic and "appliancestatus" in topic:
-            for parameter in payload["parameters"]:
-                appliance.attributes["parameters"][parameter["parName"]].update(
-                    parameter
-                )
-            appliance.sync_params_to_command("settings")
-        elif topic and "disconnected" in topic:
+        changed: Set[str] = set()
+        for parameter in payload["parameters"]:
+            name = parameter.get("parName", "")
+            if (attribute := appliance.attributes["parameters"].get(name)) is None:
+                _LOGGER.debug("Ignore unknown parameter %s", name)
+                continue
+            previous = str(attribute)
+            attribute.update(parameter)
+            if str(attribute) != previous:
+                changed.add(name)
+        appliance.last_mqtt_update = datetime.now()
+        return changed
+
+    def _update_appliance(
+        self, appliance: HonAppliance, topic: str, payload: Dict[str, Any]
+    ) -> Set[str]:
+        """Apply a message, returns the changed parameters of the appliance"""
+        if "appliancestatus" in topic and appliance.loaded:
+            return self._update_parameters(appliance, payload)
+        if "disconnected" in topic:
             _LOGGER.info(
                 "Disconnected %s: %s",
                 appliance.nick_name,
                 payload.get("disconnectReason"),
             )
             appliance.connection = False
-        elif topic and "connected" in topic:
+            self._hon.notifier.add(appliance, event="disconnected")
+        elif "connected" in topic:
             appliance.connection = True
             _LOGGER.info("Connected %s", appliance.nick_name)
-        elif topic and "discovery" in topic:
+            self._hon.notifier.add(appliance, event="connected")
+        elif "discovery" in topic:
             _LOGGER.info("Discovered %s", appliance.nick_name)
-        self._hon.notify()
+            self._hon.notifier.add(appliance, event="discovered")
+        return set()
+
+    def _on_publish_received(self, data: mqtt5.PublishReceivedData) -> None:
+        if not (data and data.publish_packet and data.publish_packet.payload):
+            return
+        topic = data.publish_packet.topic
+        if topic not in self._topic_index:
+            _LOGGER.debug("Ignore message of unknown topic %s", topic)
+            return
+        message = (topic, bytes(data.publish_packet.payload))
+        if self._config.backpressure != "block":
+            self._call_soon(self._enqueue, message)
+        elif self._loop is not None and not self._closing:
+            self._put_blocking(self._loop, message)
+
+    def _put_blocking(self, loop: asyncio.AbstractEventLoop, message: Message) -> None:
+        """Hold the awscrt thread, this throttles reading from the socket"""
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._queue.put(message), loop)
+        except RuntimeError:
+            _LOGGER.debug("Event loop closed, drop mqtt message")
+            return
+        self._blocked.add(future)
+        if self._closing:
+            future.cancel()
+        try:
+            future.result(self._config.block_timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            metrics.registry.inc("pyhon_mqtt_dropped_total", policy="block")
+            _LOGGER.warning("Mqtt queue full for too long, drop message")
+        except concurrent.futures.CancelledError:
+            _LOGGER.debug("Mqtt client closed, drop message")
+        finally:
+            self._blocked.discard(future)
+
+    def _enqueue(self, message: Message) -> None:
+        if self._queue.full():
+            policy = self._config.backpressure
+            metrics.registry.inc("pyhon_mqtt_dropped_total", policy=policy)
+            if not self._overflow:
+                _LOGGER.warning("Mqtt queue full, dropping %s messages", policy[5:])
+                self._overflow = True
+            if policy == "drop_newest":
+                return
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+    async def _consume(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._config.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._process(batch)
+            self._overflow = not self._queue.empty()
+            # Let other tasks run between batches of a burst
+            await asyncio.sleep(0)
+
+    def _process(self, batch: List[Message]) -> None:
+        metrics.registry.observe("pyhon_mqtt_batch_size", len(batch))
+        changed: Dict[int, Tuple[HonAppliance, Set[str]]] = {}
+        for topic, raw in batch:
+            try:
+                self._apply(topic, raw, changed)
+            except Exception as error:  # pylint: disable=broad-except
+                _LOGGER.warning("Ignore invalid message of %s - %s", topic, error)
+        # Rules cascade on every sync, run them once per appliance and batch
+        for appliance, keys in changed.values():
+            try:
+                appliance.sync_params_to_command("settings")
+            except Exception as error:  # pylint: disable=broad-except
+                _LOGGER.exception("Sync of %s failed - %s", appliance.nick_name, error)
+            self._hon.notifier.add(appliance, keys)
+
+    def _apply(
+        self,
+        topic: str,
+        raw: bytes,
+        changed: Dict[int, Tuple[HonAppliance, Set[str]]],
+    ) -> None:
+        payload = codec.loads(raw)
+        metrics.registry.inc("pyhon_mqtt_messages_total", type=self._topic_type(topic))
+        # Zones of an appliance share its topics
+        for appliance in self._topic_index.get(topic, []):
+            if keys := self._update_appliance(appliance, topic, payload):
+                _, known = changed.setdefault(id(appliance), (appliance, set()))
+                known.update(keys)
         _LOGGER.info("%s - %s", topic, payload)
 
+    @staticmethod
+    def _topic_type(topic: str) -> str:
+        for topic_type in ("appliancestatus", "disconnected", "connected", "discovery"):
+            if topic_type in topic:
+                return topic_type
+        return "other"
+
     async def _start(self) -> None:
         self._client = mqtt5_client_builder.websockets_with_custom_authorizer(
             endpoint=const.AWS_ENDPOINT,
@@ -122,16 +297,62 @@ class MQTTClient:
         )
         self.client.start()
 
-    def _subscribe_appliances(self) -> None:
+    async def _subscribe_appliances(self) -> None:
+        self._index_topics()
+        await asyncio.gather(*map(self._subscribe_topic, self._topic_index))
+
+    @staticmethod
+    def _topics(appliance: HonAppliance) -> List[str]:
+        topics: List[str] = appliance.info.get("topics", {}).get("subscribe", [])
+        return topics
+
+    async def _subscribe_topic(self, topic: str) -> None:
+        future = self.client.subscribe(
+            mqtt5.SubscribePacket([mqtt5.Subscription(topic)])
+        )
+        await asyncio.wait_for(asyncio.wrap_future(future), 10)
+        _LOGGER.info("Subscribed to topic %s", topic)
+
+    async def _unsubscribe_topic(self, topic: str) -> None:
+        future = self.client.unsubscribe(mqtt5.UnsubscribePacket([topic]))
+        await asyncio.wait_for(asyncio.wrap_future(future), 10)
+        _LOGGER.info("Unsubscribed from topic %s", topic)
+
+    def _index_topics(self) -> None:
+        index: Dict[str, List[HonAppliance]] = {}
         for appliance in self._appliances:
-            self._subscribe(appliance)
+            for topic in self._topics(appliance):
+                index.setdefault(topic, []).append(appliance)
+        # Replaced as a whole, topics are looked up from another thread
+        self._topic_index = index
+
+    async def update_subscriptions(self) -> None:
+        """Follow added and removed appliances, subscribe only changed topics"""
+        previous = set(self._topic_index)
+        self._index_topics()
+        current = set(self._topic_index)
+        await asyncio.gather(
+            *map(self._subscribe_topic, sorted(current - previous)),
+            *map(self._unsubscribe_topic, sorted(previous - current)),
+        )
 
-    def _subscribe(self, appliance: HonAppliance) -> None:
-        for topic in appliance.info.get("topics", {}).get("subscribe", []):
-            self.client.subscribe(
-                mqtt5.SubscribePacket([mqtt5.Subscription(topic)])
-            ).result(10)
-            _LOGGER.info("Subscribed to topic %s", topic)
+    def _on_token_update(self, _: str) -> None:
+        if self._restart_task is None or self._restart_task.done():
+            _LOGGER.info("Token renewed, reconnect mqtt")
+            metrics.registry.inc("pyhon_mqtt_restarts_total", reason="token")
+            self._restart_task = asyncio.create_task(self._restart())
+
+    async def _restart(self) -> None:
+        async with self._restart_lock:
+            if self._client is not None:
+                self._stopped.clear()
+                self._client.stop()
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), 10)
+                except asyncio.TimeoutError:
+                    _LOGGER.warning("Mqtt client didn't stop in time")
+            await self._start()
+            await self._subscribe_appliances()
 
     async def start_watchdog(self) -> None:
         if not self._watchdog_task or self._watchdog_task.done():
@@ -140,7 +361,17 @@ class MQTTClient:
     async def _watchdog(self) -> None:
         while True:
             await asyncio.sleep(5)
-            if not self._connection:
+            if not self._connection and not self._restart_lock.locked():
                 _LOGGER.info("Restart mqtt connection")
-                await self._start()
-                self._subscribe_appliances()
+                metrics.registry.inc("pyhon_mqtt_restarts_total", reason="watchdog")
+                await self._restart()
+
+    async def close(self) -> None:
+        self._closing = True
+        for future in list(self._blocked):
+            future.cancel()
+        for task in (self._consumer_task, self._watchdog_task, self._restart_task):
+            if task is not None and not task.done():
+                task.cancel()
+        if self._client is not None:
+            self._client.stop()
@@ -0,0 +1,139 @@
+import time
+from collections import Counter
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from pyhon.connection.tracing import HonTracer
+
+
+@dataclass
+class HonPoolConfig:
+    """Connector and timeout settings shared by all handlers of an api"""
+
+    limit: int = 100
+    limit_per_host: int = 10
+    keepalive_timeout: float = 30
+    dns_ttl: int = 10 * 60
+    total_timeout: float = 60
+    connect_timeout: float = 15
+    read_timeout: float = 30
+
+    def connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_ttl,
+        )
+
+    def timeout(self) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(
+            total=self.total_timeout,
+            connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+
+
+# pylint: disable=too-many-instance-attributes
+class HonConnectionPool:
+    """One connector for all sessions of an api, with usage statistics"""
+
+    def __init__(self, config: Optional[HonPoolConfig] = None) -> None:
+        self._config: HonPoolConfig = config or HonPoolConfig()
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._requests: int = 0
+        self._reused: int = 0
+        self._queued: int = 0
+        self._queued_time: float = 0.0
+        self._dns_hits: int = 0
+        self._dns_misses: int = 0
+        self._created: Counter[str] = Counter()
+        self._trace_config = self._create_trace_config()
+
+    @property
+    def config(self) -> HonPoolConfig:
+        return self._config
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        if self._connector is None:
+            self._connector = self._config.connector()
+        return self._connector
+
+    def session(self) -> aiohttp.ClientSession:
+        """New session on the shared connector, closing it keeps the pool"""
+        return aiohttp.ClientSession(
+            connector=self.connector,
+            connector_owner=False,
+            timeout=self._config.timeout(),
+            trace_configs=[self._trace_config, HonTracer().trace_config()],
+        )
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self._requests,
+            "connections_created": sum(self._created.values()),
+            "connections_reused": self._reused,
+            "connections_per_host": dict(self._created),
+            "queued": self._queued,
+            "queued_time": round(self._queued_time, 3),
+            "dns_cache_hits": self._dns_hits,
+            "dns_cache_misses": self._dns_misses,
+        }
+
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_end.append(self._on_connection_create)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+        trace_config.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        return trace_config
+
+    async def _on_request_start(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self._requests += 1
+        context.host = params.url.host or ""
+
+    async def _on_queued_start(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, __: Any
+    ) -> None:
+        self._queued += 1
+        context.queued = time.monotonic()
+
+    async def _on_queued_end(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, __: Any
+    ) -> None:
+        self._queued_time += time.monotonic() - context.queued
+
+    async def _on_connection_create(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, __: Any
+    ) -> None:
+        self._created[getattr(context, "host", "")] += 1
+
+    async def _on_connection_reuse(
+        self, _: aiohttp.ClientSession, __: SimpleNamespace, ___: Any
+    ) -> None:
+        self._reused += 1
+
+    async def _on_dns_cache_hit(
+        self, _: aiohttp.ClientSession, __: SimpleNamespace, ___: Any
+    ) -> None:
+        self._dns_hits += 1
+
+    async def _on_dns_cache_miss(
+        self, _: aiohttp.ClientSession, __: SimpleNamespace, ___: Any
+    ) -> None:
+        self._dns_misses += 1
+
+    async def close(self) -> None:
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
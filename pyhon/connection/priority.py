@@ -0,0 +1,95 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Dict, List, Tuple
+
+
+class HonPriority(IntEnum):
+    INTERACTIVE = 0  # commands triggered by users
+    STATE = 1  # appliance state and command refresh
+    BACKGROUND = 2  # statistics, history and diagnostics
+
+
+class HonRequestScheduler:
+    """Limits concurrent api requests, admitting higher priorities first"""
+
+    def __init__(self, concurrency: int = 6, reserved: int = 1) -> None:
+        self._concurrency: int = max(concurrency, 1)
+        # Slots only interactive requests may use, so they never queue long
+        self._reserved: int = min(max(reserved, 0), self._concurrency - 1)
+        self._active: int = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Requests and waited seconds per priority"""
+        return {priority: stats.copy() for priority, stats in self._stats.items()}
+
+    def _limit(self, priority: HonPriority) -> int:
+        if priority == HonPriority.INTERACTIVE:
+            return self._concurrency
+        return self._concurrency - self._reserved
+
+    def _wake(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._active >= self._limit(HonPriority(priority)):
+                break
+            heapq.heappop(self._waiters)
+            self._active += 1
+            future.set_result(None)
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._wake()
+
+    async def _acquire(self, priority: HonPriority) -> None:
+        if not self._waiters and self._active < self._limit(priority):
+            self._active += 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _record(self, priority: HonPriority, waited: float) -> None:
+        stats = self._stats.setdefault(
+            priority.name.lower(), {"requests": 0, "waited": 0.0, "max_wait": 0.0}
+        )
+        stats["requests"] += 1
+        stats["waited"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: HonPriority = HonPriority.STATE
+    ) -> AsyncIterator[None]:
+        start = time.monotonic()
+        await self._acquire(priority)
+        self._record(priority, time.monotonic() - start)
+        try:
+            yield
+        finally:
+            self._release()
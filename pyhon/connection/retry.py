@@ -0,0 +1,59 @@
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HonCircuitBreaker:
+    """Stops requests to a host after repeated failures for some time"""
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30) -> None:
+        self._threshold: int = max(threshold, 1)
+        self._reset_timeout: float = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened: Dict[str, float] = {}
+
+    def state(self, host: str) -> str:
+        if host not in self._opened:
+            return "closed"
+        if time.monotonic() - self._opened[host] < self._reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow(self, host: str) -> bool:
+        if (state := self.state(host)) == "half-open":
+            # Let a single trial request through, block the others meanwhile
+            self._opened[host] = time.monotonic()
+        return state != "open"
+
+    def failure(self, host: str) -> None:
+        self._failures[host] = self._failures.get(host, 0) + 1
+        if self._failures[host] >= self._threshold:
+            if host not in self._opened:
+                _LOGGER.warning("Circuit opened for %s", host)
+            self._opened[host] = time.monotonic()
+
+    def success(self, host: str) -> None:
+        self._failures.pop(host, None)
+        if self._opened.pop(host, None) is not None:
+            _LOGGER.info("Circuit closed for %s", host)
+
+
+@dataclass
+class HonRetryPolicy:
+    """Exponential backoff with full jitter for idempotent requests"""
+
+    attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 10
+    statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    breaker: HonCircuitBreaker = field(default_factory=HonCircuitBreaker)
+
+    def delay(self, attempt: int, retry_after: str = "") -> float:
+        """Seconds to wait after the given (zero based) failed attempt"""
+        if retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
@@ -0,0 +1,72 @@
+import asyncio
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from pyhon import codec
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HonAuthStore:
+    """Keeps auth sessions in memory, base for persistent stores"""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+
+    async def load(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._sessions.get(key)
+
+    async def save(self, key: str, data: Dict[str, Any]) -> None:
+        self._sessions[key] = data
+
+    async def delete(self, key: str) -> None:
+        self._sessions.pop(key, None)
+
+
+class HonFileAuthStore(HonAuthStore):
+    """Persists auth sessions as json files only readable by the owner"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        super().__init__()
+        self._path: Path = path or Path.home() / ".pyhon"
+
+    def _file(self, key: str) -> Path:
+        name = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return self._path / f"auth_{name}.json"
+
+    def _read(self, file: Path) -> Optional[Dict[str, Any]]:
+        if not file.exists():
+            return None
+        try:
+            data: Dict[str, Any] = codec.loads(file.read_bytes())
+            return data
+        except (OSError, ValueError) as error:
+            _LOGGER.warning("Can't read auth session %s - %s", str(file), error)
+            return None
+
+    def _write(self, file: Path, data: Dict[str, Any]) -> None:
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+            with os.fdopen(os.open(file, flags, 0o600), "wb") as auth_file:
+                auth_file.write(codec.dumpb(data))
+        except OSError as error:
+            _LOGGER.warning("Can't write auth session %s - %s", str(file), error)
+
+    async def load(self, key: str) -> Optional[Dict[str, Any]]:
+        if (data := await super().load(key)) is None:
+            if (data := await asyncio.to_thread(self._read, self._file(key))) is None:
+                return None
+            await super().save(key, data)
+        return data
+
+    async def save(self, key: str, data: Dict[str, Any]) -> None:
+        await super().save(key, data)
+        await asyncio.to_thread(self._write, self._file(key), data)
+
+    async def delete(self, key: str) -> None:
+        await super().delete(key)
+        self._file(key).unlink(missing_ok=True)
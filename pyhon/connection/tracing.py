@@ -0,0 +1,99 @@
+import re
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from pyhon import metrics
+from pyhon.metrics import HonMetrics
+
+_MAC = re.compile("^[0-9A-Fa-f]{2}(-[0-9A-Fa-f]{2}){5}$")
+_ID = re.compile("^(?=.*\\d)[0-9A-Za-z_-]{16,}$|^\\d+$")
+
+
+def endpoint(url: str | URL) -> str:
+    """Url template without query and ids, e.g. host/appliance/{mac}/history"""
+    url = URL(str(url))
+    parts = []
+    for part in url.path.split("/"):
+        if _MAC.match(part):
+            part = "{mac}"
+        elif _ID.match(part):
+            part = "{id}"
+        parts.append(part)
+    return f"{url.host}{'/'.join(parts)}"
+
+
+class HonTracer:
+    """Records network timings and transferred bytes of aiohttp requests"""
+
+    def __init__(self, registry: HonMetrics = metrics.registry) -> None:
+        self._registry: HonMetrics = registry
+
+    @property
+    def registry(self) -> HonMetrics:
+        return self._registry
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace_config.on_connection_create_start.append(self._on_connect_start)
+        trace_config.on_connection_create_end.append(self._on_connect_end)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_chunk_sent.append(self._on_chunk_sent)
+        trace_config.on_response_chunk_received.append(self._on_chunk_received)
+        return trace_config
+
+    async def _on_request_start(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        context.start = time.monotonic()
+        context.host = params.url.host or ""
+        context.endpoint = endpoint(params.url)
+
+    async def _on_dns_start(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, __: Any
+    ) -> None:
+        context.dns_start = time.monotonic()
+
+    async def _on_dns_end(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, __: Any
+    ) -> None:
+        seconds = time.monotonic() - context.dns_start
+        self._registry.observe("pyhon_http_dns_seconds", seconds, host=context.host)
+
+    async def _on_connect_start(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, __: Any
+    ) -> None:
+        context.connect_start = time.monotonic()
+
+    async def _on_connect_end(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, __: Any
+    ) -> None:
+        # aiohttp reports tcp connect and tls handshake as one step
+        seconds = time.monotonic() - context.connect_start
+        self._registry.observe("pyhon_http_connect_seconds", seconds, host=context.host)
+
+    async def _on_request_end(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, __: Any
+    ) -> None:
+        seconds = time.monotonic() - context.start
+        self._registry.observe(
+            "pyhon_http_ttfb_seconds", seconds, endpoint=context.endpoint
+        )
+
+    async def _on_chunk_sent(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        size = len(params.chunk)
+        self._registry.inc("pyhon_http_sent_bytes", size, endpoint=context.endpoint)
+
+    async def _on_chunk_received(
+        self, _: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        size = len(params.chunk)
+        self._registry.inc("pyhon_http_received_bytes", size, endpoint=context.endpoint)
@@ -1,11 +1,10 @@
 import asyncio
-import json
 import re
 import shutil
 from pathlib import Path
 from typing import TYPE_CHECKING, List, Tuple
 
-from pyhon import printer
+from pyhon import codec, printer
 
 if TYPE_CHECKING:
     from pyhon.appliance import HonAppliance
@@ -39,7 +38,7 @@ async def load_data(appliance: "HonAppliance", topic: str) -> Tuple[str, str]:
 
 
 def write_to_json(data: str, topic: str, path: Path, anonymous: bool = False) -> Path:
-    json_data = json.dumps(data, indent=4)
+    json_data = codec.dumps(data, indent=True)
     if anonymous:
         json_data = anonymize_data(json_data)
     file = path / f"{topic}.json"
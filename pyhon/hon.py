@@ -1,22 +1,34 @@
+import asyncio
 import logging
 from pathlib import Path
 from types import TracebackType
-from typing import List, Optional, Dict, Any, Type, Callable
+from typing import List, Optional, Dict, Any, Type, Callable, Awaitable, Tuple
 
 from aiohttp import ClientSession
 from typing_extensions import Self
 
+from pyhon import metrics
 from pyhon.appliance import HonAppliance
 from pyhon.connection.api import HonAPI
 from pyhon.connection.api import TestAPI
-from pyhon.connection.mqtt import MQTTClient
+from pyhon.connection.cache import HonCache
+from pyhon.connection.limiter import HonRateLimiter
+from pyhon.connection.mqtt import HonMqttConfig, MQTTClient
+from pyhon.connection.priority import HonRequestScheduler
+from pyhon.connection.pool import HonPoolConfig
+from pyhon.connection.retry import HonRetryPolicy
+from pyhon.connection.store import HonAuthStore
 from pyhon.exceptions import NoAuthenticationException
+from pyhon.notifier import HonNotifier, HonUpdate
+from pyhon.scheduler import HonUpdateScheduler, HonPollingPolicy
 
 _LOGGER = logging.getLogger(__name__)
 
 
-# pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-instance-attributes,too-many-arguments,too-many-locals
 class Hon:
+    _SETUP_CONCURRENCY = 5
+
     def __init__(
         self,
         email: Optional[str] = "",
@@ -25,6 +37,18 @@ class Hon:
         mobile_id: str = "",
         refresh_token: str = "",
         test_data_path: Optional[Path] = None,
+        *,
+        setup_concurrency: int = _SETUP_CONCURRENCY,
+        cache: Optional[HonCache] = None,
+        lazy: bool = False,
+        update_intervals: Optional[Dict[str, float]] = None,
+        auth_store: Optional[HonAuthStore] = None,
+        pool_config: Optional[HonPoolConfig] = None,
+        retry_policy: Optional[HonRetryPolicy] = None,
+        rate_limiter: Optional[HonRateLimiter] = None,
+        request_scheduler: Optional[HonRequestScheduler] = None,
+        mqtt_config: Optional[HonMqttConfig] = None,
+        notify_window: float = HonNotifier.WINDOW,
     ):
         self._email: Optional[str] = email
         self._password: Optional[str] = password
@@ -35,7 +59,19 @@ class Hon:
         self._mobile_id: str = mobile_id
         self._refresh_token: str = refresh_token
         self._mqtt_client: MQTTClient | None = None
-        self._notify_function: Optional[Callable[[Any], None]] = None
+        self._notify_function: Optional[Callable[[List[HonUpdate]], None]] = None
+        self._setup_semaphore = asyncio.Semaphore(max(setup_concurrency, 1))
+        self._cache: Optional[HonCache] = cache
+        self._lazy: bool = lazy
+        self._update_intervals: Dict[str, float] = update_intervals or {}
+        self._scheduler: Optional[HonUpdateScheduler] = None
+        self._auth_store: Optional[HonAuthStore] = auth_store
+        self._pool_config: Optional[HonPoolConfig] = pool_config
+        self._retry_policy: Optional[HonRetryPolicy] = retry_policy
+        self._rate_limiter: Optional[HonRateLimiter] = rate_limiter
+        self._request_scheduler: Optional[HonRequestScheduler] = request_scheduler
+        self._mqtt_config: Optional[HonMqttConfig] = mqtt_config
+        self._notifier = HonNotifier(self.notify, notify_window)
 
     async def __aenter__(self) -> Self:
         return await self.create()
@@ -73,6 +109,12 @@ class Hon:
             session=self._session,
             mobile_id=self._mobile_id,
             refresh_token=self._refresh_token,
+            cache=self._cache,
+            auth_store=self._auth_store,
+            pool_config=self._pool_config,
+            retry_policy=self._retry_policy,
+            rate_limiter=self._rate_limiter,
+            request_scheduler=self._request_scheduler,
         ).create()
         await self.setup()
         return self
@@ -86,29 +128,53 @@ class Hon:
         self._appliances = appliances
 
     async def _create_appliance(
-        self, appliance_data: Dict[str, Any], api: HonAPI, zone: int = 0
-    ) -> None:
-        appliance = HonAppliance(api, appliance_data, zone=zone)
+        self, appliance_data: Dict[str, Any], api: HonAPI, zones: int = 0
+    ) -> List[HonAppliance]:
+        zone_data = [appliance_data.copy() for _ in range(zones)]
+        appliance = HonAppliance(api, appliance_data, lazy=self._lazy)
         if appliance.mac_address == "":
-            return
-        try:
-            await appliance.load_commands()
-            await appliance.load_attributes()
-            await appliance.load_statistics()
-        except (KeyError, ValueError, IndexError) as error:
-            _LOGGER.exception(error)
-            _LOGGER.error("Device data - %s", appliance_data)
-        self._appliances.append(appliance)
+            return []
+        zone_views = [
+            HonAppliance(api, data, zone=zone + 1, template=appliance, lazy=self._lazy)
+            for zone, data in enumerate(zone_data)
+        ]
+        for zone_appliance in [appliance, *zone_views]:
+            if interval := self._update_intervals.get(appliance.appliance_type):
+                zone_appliance.minimal_update_interval = interval
+        if not self._lazy:
+            async with self._setup_semaphore:
+                for zone_appliance in [appliance, *zone_views]:
+                    await zone_appliance.ensure_loaded()
+        return zone_views + [appliance]
+
+    @staticmethod
+    def _zones(appliance_data: Dict[str, Any]) -> int:
+        if (zones := int(appliance_data.get("zone", "0"))) > 1:
+            return zones
+        return 0
+
+    def _appliance_keys(self, appliance_data: Dict[str, Any]) -> List[Tuple[str, int]]:
+        mac_address = appliance_data.get("macAddress", "")
+        zones = self._zones(appliance_data)
+        return [(mac_address, zone + 1) for zone in range(zones)] + [(mac_address, 0)]
+
+    def _appliance_tasks(
+        self, appliances: List[Dict[str, Any]], api: HonAPI
+    ) -> List[Awaitable[List[HonAppliance]]]:
+        return [
+            self._create_appliance(appliance, api, zones=self._zones(appliance))
+            for appliance in appliances
+        ]
+
+    async def _create_appliances(
+        self, tasks: List[Awaitable[List[HonAppliance]]]
+    ) -> None:
+        for appliances in await asyncio.gather(*tasks):
+            self._appliances.extend(appliances)
 
     async def setup(self) -> None:
         appliances = await self.api.load_appliances()
-        for appliance in appliances:
-            if (zones := int(appliance.get("zone", "0"))) > 1:
-                for zone in range(zones):
-                    await self._create_appliance(
-                        appliance.copy(), self.api, zone=zone + 1
-                    )
-            await self._create_appliance(appliance, self.api)
+        tasks = self._appliance_tasks(appliances, self.api)
         if (
             self._test_data_path
             and (
@@ -118,16 +184,100 @@ class Hon:
         ):
             api = TestAPI(test_data)
             for appliance in await api.load_appliances():
-                await self._create_appliance(appliance, api)
+                tasks.append(self._create_appliance(appliance, api))
+        await self._create_appliances(tasks)
         if not self._mqtt_client:
-            self._mqtt_client = await MQTTClient(self, self._mobile_id).create()
+            self._mqtt_client = await MQTTClient(
+                self, self._mobile_id, self._mqtt_config
+            ).create()
+
+    async def refresh_appliances(self) -> None:
+        """Add new and drop removed appliances, keep all others untouched"""
+        known = {
+            (appliance.mac_address, appliance.zone): appliance
+            for appliance in self._appliances
+            if appliance.api is self.api
+        }
+        groups: List[List[HonAppliance]] = []
+        new_data: Dict[int, Dict[str, Any]] = {}
+        for appliance_data in await self.api.load_appliances():
+            keys = self._appliance_keys(appliance_data)
+            if all(key in known for key in keys):
+                groups.append([known[key] for key in keys])
+            else:
+                new_data[len(groups)] = appliance_data
+                groups.append([])
+        created = await asyncio.gather(
+            *self._appliance_tasks(list(new_data.values()), self.api)
+        )
+        for index, appliances in zip(new_data, created):
+            groups[index] = appliances
+        current = [appliance for group in groups for appliance in group]
+        others = [a for a in self._appliances if a.api is not self.api]
+        current_ids = {id(appliance) for appliance in current}
+        removed = [a for a in known.values() if id(a) not in current_ids]
+        added = [appliance for group in created for appliance in group]
+        _LOGGER.info(
+            "Appliances refreshed, %d added, %d removed", len(added), len(removed)
+        )
+        self._appliances[:] = current + others
+        if self._mqtt_client:
+            await self._mqtt_client.update_subscriptions()
 
-    def subscribe_updates(self, notify_function: Callable[[Any], None]) -> None:
+    @property
+    def scheduler(self) -> Optional[HonUpdateScheduler]:
+        return self._scheduler
+
+    def start_scheduler(
+        self, scheduler: Optional[HonUpdateScheduler] = None
+    ) -> HonUpdateScheduler:
+        """Refresh all appliances in background, replaces per appliance timers"""
+        if scheduler is not None and scheduler is not self._scheduler:
+            if self._scheduler is not None and self._scheduler.running:
+                raise ValueError("Another scheduler is already running")
+            self._scheduler = scheduler
+        elif self._scheduler is None:
+            self._scheduler = HonUpdateScheduler(
+                self._appliances, policy=HonPollingPolicy()
+            )
+        self._scheduler.start()
+        return self._scheduler
+
+    @property
+    def notifier(self) -> HonNotifier:
+        return self._notifier
+
+    def subscribe_updates(
+        self, notify_function: Callable[[List[HonUpdate]], None]
+    ) -> None:
+        """Called with a list of HonUpdate, one per changed appliance"""
         self._notify_function = notify_function
 
-    def notify(self) -> None:
+    def notify(self, updates: Optional[List[HonUpdate]] = None) -> None:
+        metrics.registry.inc("pyhon_notify_total")
+        if updates:
+            changes = sum(len(update.parameters) for update in updates)
+            metrics.registry.observe("pyhon_notify_changes", changes)
         if self._notify_function:
-            self._notify_function(None)
+            self._notify_function(updates or [])
+
+    def metrics(self) -> str:
+        """Metrics in prometheus text format, request metrics are process-wide"""
+        metrics.registry.set("pyhon_appliances", len(self._appliances))
+        if self._mqtt_client is not None:
+            connected = int(self._mqtt_client.connected)
+            metrics.registry.set("pyhon_mqtt_connected", connected)
+            metrics.registry.set("pyhon_mqtt_queued", self._mqtt_client.queued)
+        if self._api is not None:
+            scheduler = self._api.request_scheduler
+            metrics.registry.set("pyhon_requests_active", scheduler.active)
+            metrics.registry.set("pyhon_requests_waiting", scheduler.waiting)
+        return metrics.registry.prometheus()
 
     async def close(self) -> None:
+        if self._scheduler is not None:
+            await self._scheduler.stop()
+        if self._mqtt_client is not None:
+            await self._mqtt_client.close()
+        self._notifier.flush()
         await self.api.close()
@@ -0,0 +1,142 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from pyhon.typedefs import MetricHook
+
+_LOGGER = logging.getLogger(__name__)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class HonTiming:
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+
+class HonMetrics:
+    """In-process registry of counters, gauges and timings, thread-safe"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._timings: Dict[str, Dict[Labels, HonTiming]] = {}
+        self._hooks: List[MetricHook] = []
+
+    @staticmethod
+    def _labels(labels: Dict[str, str]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @property
+    def counters(self) -> Dict[str, Dict[Labels, float]]:
+        with self._lock:
+            return {name: values.copy() for name, values in self._counters.items()}
+
+    @property
+    def gauges(self) -> Dict[str, Dict[Labels, float]]:
+        with self._lock:
+            return {name: values.copy() for name, values in self._gauges.items()}
+
+    @property
+    def timings(self) -> Dict[str, Dict[Labels, HonTiming]]:
+        with self._lock:
+            return {
+                name: {
+                    labels: HonTiming(**vars(timing)) for labels, timing in v.items()
+                }
+                for name, v in self._timings.items()
+            }
+
+    def counter(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(self._labels(labels), 0)
+
+    def timing(self, name: str, **labels: str) -> Optional[HonTiming]:
+        with self._lock:
+            timing = self._timings.get(name, {}).get(self._labels(labels))
+            return HonTiming(**vars(timing)) if timing else None
+
+    def add_hook(self, hook: MetricHook) -> None:
+        """Forward every recorded value, e.g. to an external monitoring"""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: MetricHook) -> None:
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    def _notify(self, kind: str, name: str, value: float, labels: Labels) -> None:
+        for hook in self._hooks:
+            try:
+                hook(kind, name, value, dict(labels))
+            except Exception as error:  # pylint: disable=broad-except
+                _LOGGER.warning("Metric hook %s failed - %s", hook, error)
+
+    def inc(self, name: str, value: float = 1, /, **labels: str) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            values = self._counters.setdefault(name, {})
+            values[key] = values.get(key, 0) + value
+        self._notify("counter", name, value, key)
+
+    def set(self, name: str, value: float, /, **labels: str) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+        self._notify("gauge", name, value, key)
+
+    def observe(self, name: str, value: float, /, **labels: str) -> None:
+        """Record a sample, usually a duration in seconds"""
+        key = self._labels(labels)
+        with self._lock:
+            self._timings.setdefault(name, {}).setdefault(key, HonTiming()).add(value)
+        self._notify("timing", name, value, key)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+    @staticmethod
+    def _sample(name: str, labels: Labels, value: float) -> str:
+        value = float(value)
+        number = str(int(value)) if value.is_integer() else repr(value)
+        if not labels:
+            return f"{name} {number}"
+        escape = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+        text = ",".join(f'{key}="{str(val).translate(escape)}"' for key, val in labels)
+        return f"{name}{{{text}}} {number}"
+
+    def prometheus(self) -> str:
+        """All metrics in prometheus text exposition format"""
+        lines: List[str] = []
+        for kind, values in (("counter", self.counters), ("gauge", self.gauges)):
+            for name, samples in sorted(values.items()):
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples.items():
+                    lines.append(self._sample(name, labels, value))
+        for name, timings in sorted(self.timings.items()):
+            lines.append(f"# TYPE {name} summary")
+            for labels, timing in timings.items():
+                lines.append(self._sample(f"{name}_count", labels, timing.count))
+                lines.append(self._sample(f"{name}_sum", labels, timing.total))
+            lines.append(f"# TYPE {name}_max gauge")
+            for labels, timing in timings.items():
+                lines.append(self._sample(f"{name}_max", labels, timing.maximum))
+        return "\n".join(lines) + "\n"
+
+
+registry = HonMetrics()
@@ -0,0 +1,68 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyhon.appliance import HonAppliance
+
+
+@dataclass
+class HonUpdate:
+    """Changes of one appliance since the last notification"""
+
+    appliance: "HonAppliance"
+    parameters: Set[str] = field(default_factory=set)
+    # In order of arrival: connected, disconnected or discovered
+    events: List[str] = field(default_factory=list)
+
+
+class HonNotifier:
+    """Collects appliance changes and reports them once per window"""
+
+    WINDOW = 0.1  # seconds
+
+    def __init__(
+        self, callback: Callable[[List[HonUpdate]], None], window: float = WINDOW
+    ) -> None:
+        self._callback = callback
+        self._window: float = max(window, 0)
+        self._updates: Dict[int, HonUpdate] = {}
+        self._handle: Optional[asyncio.Handle] = None
+
+    @property
+    def window(self) -> float:
+        return self._window
+
+    @property
+    def pending(self) -> List[HonUpdate]:
+        return list(self._updates.values())
+
+    def add(
+        self,
+        appliance: "HonAppliance",
+        parameters: Iterable[str] = (),
+        event: str = "",
+    ) -> None:
+        update = self._updates.setdefault(id(appliance), HonUpdate(appliance))
+        update.parameters.update(parameters)
+        if event:
+            update.events.append(event)
+        if self._handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        # The window starts with the first change, so a steady stream of
+        # messages still gets reported at least once per window
+        self._handle = loop.call_later(self._window, self.flush)
+
+    def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._updates:
+            return
+        updates, self._updates = list(self._updates.values()), {}
+        self._callback(updates)
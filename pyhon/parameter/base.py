@@ -1,10 +1,14 @@
 from typing import Dict, Any, List, Tuple, Callable, TYPE_CHECKING
 
+from pyhon import metrics
+
 if TYPE_CHECKING:
     from pyhon.rules import HonRule
 
 
 class HonParameter:
+    _trigger_depth: int = 0
+
     def __init__(self, key: str, attributes: Dict[str, Any], group: str) -> None:
         self._key = key
         self._attributes = attributes
@@ -27,6 +31,10 @@ class HonParameter:
     def key(self) -> str:
         return self._key
 
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        return self._attributes
+
     @property
     def value(self) -> str | float:
         return self._value if self._value is not None else "0"
@@ -70,9 +78,18 @@ class HonParameter:
     def check_trigger(self, value: str | float) -> None:
         triggers = {str(k).lower(): v for k, v in self._triggers.items()}
         if str(value).lower() in triggers:
-            for trigger in triggers[str(value)]:
-                func, args = trigger
-                func(args)
+            # Triggered rules may set other parameters and trigger further rules
+            HonParameter._trigger_depth += 1
+            metrics.registry.observe(
+                "pyhon_rule_cascade_depth", HonParameter._trigger_depth
+            )
+            try:
+                for trigger in triggers[str(value)]:
+                    metrics.registry.inc("pyhon_rule_triggers_total")
+                    func, args = trigger
+                    func(args)
+            finally:
+                HonParameter._trigger_depth -= 1
 
     @property
     def triggers(self) -> Dict[str, Any]:
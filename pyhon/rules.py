@@ -123,18 +123,19 @@ class HonRuleSet:
         if default_value := rule.param_data.get("defaultValue"):
             param.value = default_value
 
+    def _apply(self, rule: HonRule) -> None:
+        if not self._extra_rules_matches(rule):
+            return
+        if not (param := self._command.parameters.get(rule.param_key)):
+            return
+        if fixed_value := rule.param_data.get("fixedValue", ""):
+            self._apply_fixed(param, fixed_value)
+        elif rule.param_data.get("typology") == "enum":
+            self._apply_enum(param, rule)
+
     def _add_trigger(self, parameter: "HonParameter", data: HonRule) -> None:
-        def apply(rule: HonRule) -> None:
-            if not self._extra_rules_matches(rule):
-                return
-            if not (param := self._command.parameters.get(rule.param_key)):
-                return
-            if fixed_value := rule.param_data.get("fixedValue", ""):
-                self._apply_fixed(param, fixed_value)
-            elif rule.param_data.get("typology") == "enum":
-                self._apply_enum(param, rule)
-
-        parameter.add_trigger(data.trigger_value, apply, data)
+        # Bound method instead of closure, so deepcopy rebinds it to the copy
+        parameter.add_trigger(data.trigger_value, self._apply, data)
 
     def patch(self) -> None:
         self._duplicate_for_extra_conditions()
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import aiohttp
+
+from pyhon import exceptions
+from pyhon.connection.limiter import HonTokenBucket
+
+if TYPE_CHECKING:
+    from pyhon.appliance import HonAppliance
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class HonPollingPolicy:
+    """Attribute polling intervals depending on appliance state, in seconds"""
+
+    active_interval: float = 30
+    idle_interval: float = 5 * 60
+    disconnected_interval: float = 30 * 60
+    mqtt_fresh: float = 10 * 60
+
+    def mqtt_is_fresh(self, appliance: "HonAppliance") -> bool:
+        if not (last_update := appliance.last_mqtt_update):
+            return False
+        return datetime.now() - last_update < timedelta(seconds=self.mqtt_fresh)
+
+    @staticmethod
+    def is_disconnected(appliance: "HonAppliance") -> bool:
+        last_event = appliance.attributes.get("lastConnEvent", {})
+        return not appliance.connection or last_event.get("category") == "DISCONNECTED"
+
+    def interval(self, appliance: "HonAppliance") -> Optional[float]:
+        if self.mqtt_is_fresh(appliance):
+            return None
+        if self.is_disconnected(appliance):
+            return self.disconnected_interval
+        if appliance.attributes.get("active"):
+            return self.active_interval
+        return self.idle_interval
+
+
+# pylint: disable=too-many-instance-attributes
+class HonUpdateScheduler:
+    """Refreshes all appliances of an account with a shared request budget"""
+
+    _JOBS: Dict[str, str] = {
+        "attributes": "update",
+        "statistics": "update_statistics",
+        "maintenance": "update_maintenance",
+    }
+    _TICK = 1  # seconds
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        appliances: List["HonAppliance"],
+        *,
+        attributes_interval: float = 60,
+        statistics_interval: float = 15 * 60,
+        maintenance_interval: float = 60 * 60,
+        concurrency: int = 3,
+        requests_per_minute: float = 60,
+        jitter: float = 0.1,
+        policy: Optional[HonPollingPolicy] = None,
+    ) -> None:
+        self._appliances: List["HonAppliance"] = appliances
+        self._intervals: Dict[str, float] = {
+            "attributes": attributes_interval,
+            "statistics": statistics_interval,
+            "maintenance": maintenance_interval,
+        }
+        self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self._budget = HonTokenBucket(requests_per_minute / 60, concurrency)
+        self._jitter: float = jitter
+        self._policy: Optional[HonPollingPolicy] = policy
+        self._due: Dict[Tuple[int, str], float] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+        self._jobs: Set[asyncio.Task[None]] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def interval(self, appliance: "HonAppliance", job: str) -> Optional[float]:
+        """Seconds between two runs of job for appliance, None to skip"""
+        if job == "attributes" and self._policy is not None:
+            return self._policy.interval(appliance)
+        return self._intervals.get(job) or None
+
+    def _next_due(self, interval: float) -> float:
+        spread = random.uniform(-self._jitter, self._jitter)
+        return time.monotonic() + interval * (1 + spread)
+
+    def _schedule(self) -> Dict[Tuple[int, str], "HonAppliance"]:
+        now = time.monotonic()
+        active: Dict[Tuple[int, str], "HonAppliance"] = {}
+        for appliance in self._appliances:
+            if not appliance.loaded:
+                continue
+            for job in self._JOBS:
+                if (interval := self.interval(appliance, job)) is None:
+                    continue
+                key = (id(appliance), job)
+                active[key] = appliance
+                # Spread first runs over the whole interval to avoid bursts
+                self._due.setdefault(key, now + interval * random.random())
+                self._due[key] = min(self._due[key], now + interval)
+        for key in set(self._due) - set(active):
+            self._due.pop(key)
+        return active
+
+    async def _run_job(self, appliance: "HonAppliance", job: str) -> None:
+        async with self._semaphore:
+            await self._budget.acquire()
+            try:
+                await getattr(appliance, self._JOBS[job])()
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                exceptions.HonAuthenticationError,
+                exceptions.ApiError,
+                KeyError,
+                ValueError,
+            ) as error:
+                _LOGGER.warning("%s of %s failed - %s", job, appliance.nick_name, error)
+
+    def _start_job(self, appliance: "HonAppliance", job: str) -> None:
+        task = asyncio.create_task(self._run_job(appliance, job))
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+
+    async def _run(self) -> None:
+        while True:
+            active = self._schedule()
+            now = time.monotonic()
+            for key, due in sorted(self._due.items(), key=lambda item: item[1]):
+                if due > now:
+                    break
+                appliance, job = active[key], key[1]
+                if (interval := self.interval(appliance, job)) is not None:
+                    self._due[key] = self._next_due(interval)
+                self._start_job(appliance, job)
+            next_due = min(self._due.values(), default=now + self._TICK)
+            await asyncio.sleep(min(max(next_due - now, 0), self._TICK))
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        tasks = [*self._jobs, *([self._task] if self._task else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
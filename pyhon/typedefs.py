@@ -1,4 +1,4 @@
-from typing import Union, Any, TYPE_CHECKING, Protocol
+from typing import Union, Any, TYPE_CHECKING, Protocol, Callable, Dict
 
 import aiohttp
 from yarl import URL
@@ -17,6 +17,11 @@ class Callback(Protocol):  # pylint: disable=too-few-public-methods
     ) -> aiohttp.client._RequestContextManager: ...
 
 
+JsonLoads = Callable[[bytes], Any]
+
+# kind ("counter" or "timing"), name, value, labels
+MetricHook = Callable[[str, str, float, Dict[str, str]], None]
+
 Parameter = Union[
     "HonParameter",
     "HonParameterRange",
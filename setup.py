@@ -27,6 +27,7 @@ setup(
         "yarl>=1.8",
         "awsiotsdk>=1.21.0",
     ],
+    extras_require={"speedups": ["orjson>=3.9"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Environment :: Console",